@@ -785,6 +785,8 @@ class TemporalAlgebraParser(object):
         self.nprocs = nprocs
         self.use_granularity = False
         self.time_suffix = time_suffix
+        # Evaluated temporal operators, keyed by operator string and type
+        self.toperators = {}
 
         # Topology lists
         self.temporal_topology_list = ["EQUAL", "FOLLOWS", "PRECEDES", "OVERLAPS", "OVERLAPPED", \
@@ -983,9 +985,9 @@ class TemporalAlgebraParser(object):
             # Set initial map extend of new vector map.
             mapA.set_spatial_extent(map_extent_spatial)
             mapA.set_temporal_extent(map_extent_temporal)
-            if "cmd_list" in dir(mapB):
+            if hasattr(mapB, "cmd_list"):
                 mapA.cmd_list = mapB.cmd_list
-            if "condition_value" in dir(mapB):
+            if hasattr(mapB, "condition_value"):
                 mapA.condition_value = mapB.condition_value
         else:
             # Calculate spatial extent for different overlay operations.
@@ -1057,15 +1059,21 @@ class TemporalAlgebraParser(object):
         for map_i in maplist:
             # Loop over temporal related maps and create overlay modules.
             tbrelations = map_i.get_temporal_relations()
-            # Generate an intermediate map for the result map list.
-            map_new = self.generate_new_map(base_map=map_i, bool_op='and',
-                                            copy=True,  rename=True)
+            # The intermediate map is generated for the first related map.
+            map_new = None
+            returncode = 1
             # Combine temporal and spatial extents of intermediate map with related maps.
             for topo in topolist:
-                if topo in tbrelations.keys():
-                    for map_j in (tbrelations[topo]):
+                relationmaplist = tbrelations.get(topo)
+                if relationmaplist:
+                    for map_j in relationmaplist:
                         if self._check_spatial_topology_relation(spatial_topo_list, map_i, map_j) is True:
-                            if temporal == 'r':
+                            if temporal == 'r' or map_new is None:
+                                # Do not generate an intermediate map if
+                                # no spatial overlay exist.
+                                if map_i.spatial_intersection(map_j) is None:
+                                    returncode = 0
+                                    break
                                 # Generate an intermediate map for the result map list.
                                 map_new = self.generate_new_map(base_map=map_i, bool_op='and',
                                                                 copy=True,  rename=True)
@@ -1191,9 +1199,9 @@ class TemporalAlgebraParser(object):
                     maplist = stds.get_registered_maps_as_objects(dbif=self.dbif)
                 # Create map_value as empty list item.
                 for map_i in maplist:
-                    if "map_value" not in dir(map_i):
+                    if not hasattr(map_i, "map_value"):
                         map_i.map_value = []
-                    if "condition_value" not in dir(map_i):
+                    if not hasattr(map_i, "condition_value"):
                         map_i.condition_value = []
                     # Set and check global temporal type variable and map.
                     if map_i.is_time_absolute() and self.temporaltype is None:
@@ -1216,11 +1224,11 @@ class TemporalAlgebraParser(object):
             maplist = input
             # Create map_value as empty list item.
             for map_i in maplist:
-                if "map_value" not in dir(map_i):
+                if not hasattr(map_i, "map_value"):
                     map_i.map_value = []
                 elif clear:
                     map_i.map_value = []
-                if "condition_value" not in dir(map_i):
+                if not hasattr(map_i, "condition_value"):
                     map_i.condition_value = []
                 elif clear:
                     map_i.condition_value = []
@@ -1322,7 +1330,8 @@ class TemporalAlgebraParser(object):
                                             count_map=False,
                                             compare_bool=False,
                                             compop=None,
-                                            aggregate=None):
+                                            aggregate=None,
+                                            presorted=False):
         """Build spatio-temporal topology for two space time data sets, copy map objects
           for given relation into map list.
 
@@ -1338,6 +1347,8 @@ class TemporalAlgebraParser(object):
                                related map list and comparison operator.
           :param compop: Comparison operator, && or ||.
           :param aggregate: Aggregation operator for relation map list, & or |.
+          :param presorted: Boolean if maplistA is already sorted by start time,
+                            the resulting map list will not be sorted again.
 
           :return: List of maps from maplistA that fulfil the topological relationships
                    to maplistB specified in topolist.
@@ -1476,7 +1487,9 @@ class TemporalAlgebraParser(object):
         # topological relations that must be fulfilled
         temporal_topo_list, spatial_topo_list = self._check_topology(topolist=topolist)
 
-        resultdict = {}
+        resultlist = []
+        # Unique identifiers of maps that are already in the result list
+        resultuids = set()
 
         # Create spatio-temporal topology for maplistA to maplistB.
         tb = SpatioTemporalTopologyBuilder()
@@ -1496,24 +1509,31 @@ class TemporalAlgebraParser(object):
 
             temporal_relations = map_i.get_temporal_relations()
             spatial_relations = map_i.get_spatial_relations()
+            # The spatial check does not depend on the temporal relation.
+            if self._check_spatial_topology_entries(spatial_topo_list, spatial_relations) is False:
+                continue
 
+            # The names in temporal_topo_list are already upper case.
             for temporal_topology in temporal_topo_list:
-                if temporal_topology.upper() in temporal_relations.keys():
-                    if self._check_spatial_topology_entries(spatial_topo_list, spatial_relations) is True:
-                        if count_map:
-                            relationmaplist = temporal_relations[temporal_topology.upper()]
-                            gvar = GlobalTemporalVar()
-                            gvar.td = len(relationmaplist)
-                            if "map_value" in dir(map_i):
-                                map_i.map_value.append(gvar)
-                            else:
-                                map_i.map_value = gvar
-                        # Use unique identifier, since map names may be equal
-                        resultdict[map_i.uid] = map_i
-        resultlist = resultdict.values()
+                relationmaplist = temporal_relations.get(temporal_topology)
+                if relationmaplist:
+                    if count_map:
+                        gvar = GlobalTemporalVar()
+                        gvar.td = len(relationmaplist)
+                        if not hasattr(map_i, "map_value"):
+                            map_i.map_value = []
+                        map_i.map_value.append(gvar)
+                    # Use unique identifier, since map names may be equal
+                    if map_i.uid not in resultuids:
+                        resultuids.add(map_i.uid)
+                        resultlist.append(map_i)
+                    # Without counting, a single relation selects the map.
+                    if not count_map:
+                        break
 
         # Sort list of maps chronological.
-        resultlist = sorted(resultlist, key=AbstractDatasetComparisonKeyStartTime)
+        if not presorted:
+            resultlist = sorted(resultlist, key=AbstractDatasetComparisonKeyStartTime)
 
         return(resultlist)
 
@@ -1630,11 +1650,19 @@ class TemporalAlgebraParser(object):
              (['during'], 'l', '+')
 
         """
-        p = TemporalOperatorParser()
-        p.parse(operator, optype)
-        p.relations = [rel.upper() for rel in p.relations]
+        # The same operator is often used several times in an expression,
+        # parse it only once.
+        key = (operator, optype)
+        if key not in self.toperators:
+            p = TemporalOperatorParser()
+            p.parse(operator, optype)
+            p.relations = [rel.upper() for rel in p.relations]
+            self.toperators[key] = (p.relations, p.temporal, p.function,
+                                    p.aggregate)
 
-        return(p.relations, p.temporal, p.function,  p.aggregate)
+        relations, temporal, function, aggregate = self.toperators[key]
+
+        return(list(relations), temporal, function, aggregate)
 
     def perform_temporal_selection(self,
                                    maplistA,
@@ -1714,7 +1742,7 @@ class TemporalAlgebraParser(object):
                 if map_i not in topolist:
                     resultlist.append(map_i)
                     #if assign_val:
-                    #   if "condition_value" in dir(map_i):
+                    #   if hasattr(map_i, "condition_value"):
                     #        map_i.condition_value.append(False)
 
         # Sort list of maps chronological.
@@ -1981,7 +2009,7 @@ class TemporalAlgebraParser(object):
             else:
                 boolname = eval(str(tfuncval) + comp_op + str(value))
             # Add conditional boolean value to the map.
-            if "condition_value" in dir(map_i):
+            if hasattr(map_i, "condition_value"):
                 map_i.condition_value.append(boolname)
             else:
                 map_i.condition_value = boolname
@@ -2079,7 +2107,7 @@ class TemporalAlgebraParser(object):
                 elif isinstance(expr, GlobalTemporalVar):
                     # Use according functions for different global variable types.
                     if expr.get_type() == "operator":
-                        if all(["condition_value" in dir(map_i) for map_i in thenlist]):
+                        if all([hasattr(map_i, "condition_value") for map_i in thenlist]):
                             # Add operator string to the condition list.
                             [map_i.condition_value.extend(expr.get_type_value()) for map_i in thenlist]
                     if expr.get_type() == "global":
@@ -2146,7 +2174,7 @@ class TemporalAlgebraParser(object):
 
         # Loop through map list and evaluate conditional values.
         for map_i in maplist:
-            if "condition_value" in dir(map_i):
+            if hasattr(map_i, "condition_value"):
                 # Get condition values from map object.
                 conditionlist = map_i.condition_value
                 # Evaluate conditions in list with recursive function.
@@ -2498,7 +2526,8 @@ class TemporalAlgebraParser(object):
             maplistB   = self.check_stds(t[3])
             resultlist = self.build_spatio_temporal_topology_list(maplistA,
                                                                   maplistB,
-                                                                  count_map=True)
+                                                                  count_map=True,
+                                                                  presorted=not isinstance(t[1], list))
             t[0] = resultlist
 
     def p_t_hash2(self,t):
@@ -2516,7 +2545,8 @@ class TemporalAlgebraParser(object):
             resultlist = self.build_spatio_temporal_topology_list(maplistA,
                                                                   maplistB,
                                                                   topolist,
-                                                                  count_map=True)
+                                                                  count_map=True,
+                                                                  presorted=not isinstance(t[1], list))
             t[0] = resultlist
 
     def p_t_hash_paren(self, t):
@@ -2541,12 +2571,11 @@ class TemporalAlgebraParser(object):
                     start, end, unit = map_i.get_relative_time()
                     if end is not None:
                         td = end - start
-                if "map_value" in dir(map_i):
-                    gvar = GlobalTemporalVar()
-                    gvar.td = td
-                    map_i.map_value.append(gvar)
-                else:
-                    map_i.map_value = gvar
+                gvar = GlobalTemporalVar()
+                gvar.td = td
+                if not hasattr(map_i, "map_value"):
+                    map_i.map_value = []
+                map_i.map_value.append(gvar)
 
             t[0] = maplist
         else:
@@ -2611,7 +2640,7 @@ class TemporalAlgebraParser(object):
                     td = map_i.map_value[0].td
                     boolname = eval(str(td) + comp_op + value)
                     # Add conditional boolean value to the map.
-                    if "condition_value" in dir(map_i):
+                    if hasattr(map_i, "condition_value"):
                         map_i.condition_value.append(boolname)
                     else:
                         map_i.condition_value = boolname
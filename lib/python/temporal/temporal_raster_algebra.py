@@ -85,19 +85,18 @@ class TemporalRasterAlgebraParser(TemporalRasterBaseAlgebraParser):
 
     def parse(self, expression, basename = None, overwrite=False):
         # Check for space time dataset type definitions from temporal algebra
-        l = TemporalRasterAlgebraLexer()
-        l.build()
-        l.lexer.input(expression)
+        self.lexer = TemporalRasterAlgebraLexer()
+        self.lexer.build()
+        self.lexer.lexer.input(expression)
 
         while True:
-            tok = l.lexer.token()
+            tok = self.lexer.lexer.token()
             if not tok: break
 
             if tok.type == "STVDS" or tok.type == "STRDS" or tok.type == "STR3DS":
                 raise SyntaxError("Syntax error near '%s'" %(tok.type))
 
-        self.lexer = TemporalRasterAlgebraLexer()
-        self.lexer.build()
+        # The parser resets the lexer input, so the lexer is reused
         self.parser = yacc.yacc(module=self, debug=self.debug, write_tables=False)
 
         self.overwrite = overwrite
@@ -160,13 +159,13 @@ class TemporalRasterAlgebraParser(TemporalRasterBaseAlgebraParser):
                     map_new = self.generate_new_map(map_n, bool_op = 'and', copy = True)
                     map_new.set_temporal_extent(map_i_t_extent)
                     # Create r.mapcalc expression string for the operation.
-                    if "cmd_list" in dir(map_new) and len(t) == 5:
+                    if hasattr(map_new, "cmd_list") and len(t) == 5:
                         cmdstring = "%s" %(map_new.cmd_list)
-                    elif "cmd_list" not in dir(map_new) and len(t) == 5:
+                    elif not hasattr(map_new, "cmd_list") and len(t) == 5:
                         cmdstring = "%s" %(map_n.get_id())
-                    elif "cmd_list" in dir(map_new) and len(t) in (7, 9):
+                    elif hasattr(map_new, "cmd_list") and len(t) in (7, 9):
                         cmdstring = "%s[%s,%s]" %(map_new.cmd_list, row_neigbour, col_neigbour)
-                    elif "cmd_list" not in dir(map_new) and len(t) in (7, 9):
+                    elif not hasattr(map_new, "cmd_list") and len(t) in (7, 9):
                         cmdstring = "%s[%s,%s]" %(map_n.get_id(), row_neigbour, col_neigbour)
                     # Set new command list for map.
                     map_new.cmd_list = cmdstring
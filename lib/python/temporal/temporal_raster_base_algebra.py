@@ -65,6 +65,25 @@ from .datetime_math import create_time_suffix
 from .datetime_math import create_numeric_suffix
 
 
+##############################################################################
+
+def _sub_cmdstring(map_i):
+    """This function search for command string in a map object and
+    return substitute string (contained commandstring or map name)
+
+    :param map_i: map object or string
+    :return: the command string, time difference or map id of the map
+             object, or the input itself if it is a string
+    """
+    if hasattr(map_i, "cmd_list"):
+        return(map_i.cmd_list)
+    if hasattr(map_i, "map_value") and len(map_i.map_value) > 0 and \
+       map_i.map_value[0].get_type() == "timediff":
+        return(map_i.map_value[0].get_type_value()[0])
+    if hasattr(map_i, "get_id"):
+        return(map_i.get_id())
+    return(map_i)
+
 ##############################################################################
 
 class TemporalRasterAlgebraLexer(TemporalAlgebraLexer):
@@ -96,6 +115,14 @@ class TemporalRasterAlgebraLexer(TemporalAlgebraLexer):
     # Functions that defines single maps with time stamp and without temporal extent.
     map_functions = {'map' : 'MAP'}
 
+    # Token types of all reserved words. The dictionaries are merged in
+    # reverse order of precedence, so that earlier ones win on equal names.
+    function_types = dict(map_functions)
+    function_types.update(mapcalc_functions)
+    function_types.update(TemporalAlgebraLexer.conditional_functions)
+    function_types.update(TemporalAlgebraLexer.datetime_functions)
+    function_types.update(TemporalAlgebraLexer.time_functions)
+
     # This is the list of token names.
     raster_tokens = (
         'MOD',
@@ -121,26 +148,23 @@ class TemporalRasterAlgebraLexer(TemporalAlgebraLexer):
     t_MULT                = r'[\*]'
     t_ADD                 = r'[\+]'
     t_SUB                 = r'[-]'
-    t_T_ARITH1_OPERATOR   = r'\{[\%\*\/][,]?[a-zA-Z\| ]*([,])?([lrudi]|left|right|union|disjoint|intersect)?\}'
-    t_T_ARITH2_OPERATOR   = r'\{[+-][,]?[a-zA-Z\| ]*([,])?([lrudi]|left|right|union|disjoint|intersect)?\}'
     t_L_SPAREN            = r'\['
     t_R_SPAREN            = r'\]'
 
+    # Read in a temporal arithmetic operator. Both operator types share
+    # the same pattern and are distinguished by the arithmetic symbol.
+    def t_T_ARITH_OPERATOR(self, t):
+        r'\{[\%\*\/\+\-][,]?[a-zA-Z\| ]*([,])?([lrudi]|left|right|union|disjoint|intersect)?\}'
+        if t.value[1] in '+-':
+            t.type = 'T_ARITH2_OPERATOR'
+        else:
+            t.type = 'T_ARITH1_OPERATOR'
+        return t
+
     # Parse symbols
     def temporal_symbol(self, t):
         # Check for reserved words
-        if t.value in TemporalRasterAlgebraLexer.time_functions.keys():
-            t.type = TemporalRasterAlgebraLexer.time_functions.get(t.value)
-        elif t.value in TemporalRasterAlgebraLexer.datetime_functions.keys():
-            t.type = TemporalRasterAlgebraLexer.datetime_functions.get(t.value)
-        elif t.value in TemporalRasterAlgebraLexer.conditional_functions.keys():
-            t.type = TemporalRasterAlgebraLexer.conditional_functions.get(t.value)
-        elif t.value in TemporalRasterAlgebraLexer.mapcalc_functions.keys():
-            t.type = TemporalRasterAlgebraLexer.mapcalc_functions.get(t.value)
-        elif t.value in TemporalRasterAlgebraLexer.map_functions.keys():
-            t.type = TemporalRasterAlgebraLexer.map_functions.get(t.value)
-        else:
-            t.type = 'NAME'
+        t.type = TemporalRasterAlgebraLexer.function_types.get(t.value, 'NAME')
         return t
 
 ##############################################################################
@@ -173,6 +197,8 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                                        dry_run=dry_run,
                                        nprocs=nprocs,
                                        time_suffix=time_suffix)
+        # Command strings of the single maps used with map(), keyed by map id
+        self.spmap_cmd_strings = {}
 
     def check_null(self, t):
         try:
@@ -185,7 +211,8 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
     def build_spatio_temporal_topology_list(self, maplistA, maplistB=None, topolist=["EQUAL"],
                                             assign_val=False, count_map=False, compare_bool=False,
                                             compare_cmd=False, compop=None, aggregate=None,
-                                            new=False, convert=False, operator_cmd=False):
+                                            new=False, convert=False, operator_cmd=False,
+                                            presorted=False):
         """Build temporal topology for two space time data sets, copy map objects
         for given relation into map list.
 
@@ -208,6 +235,8 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                     r.mapcalc command strings.
         :param operator_cmd: Boolean for aggregate arithmetic operators implicitly
                     in command list values based on related map lists.
+        :param presorted: Boolean if maplistA is already sorted by start time,
+                    the resulting map list will not be sorted again.
 
         :return: List of maps from maplistA that fulfil the topological relationships
               to maplistB specified in topolist.
@@ -244,14 +273,17 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         a9@B
 
         """
-        print(topolist, assign_val, count_map, compare_bool, compare_cmd,
-              compop, aggregate, new, convert, operator_cmd)
+        if self.debug:
+            print(topolist, assign_val, count_map, compare_bool, compare_cmd,
+                  compop, aggregate, new, convert, operator_cmd)
 
         # Check the topology definitions and return the list of temporal and spatial
         # topological relations that must be fulfilled
         temporal_topo_list, spatial_topo_list = self._check_topology(topolist=topolist)
 
-        resultdict = {}
+        resultlist = []
+        # Unique identifiers of maps that are already in the result list
+        resultuids = set()
         # Create temporal topology for maplistA to maplistB.
         tb = SpatioTemporalTopologyBuilder()
         # Build spatio-temporal topology
@@ -275,26 +307,87 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
 
             temporal_relations = map_i.get_temporal_relations()
             spatial_relations = map_i.get_spatial_relations()
+            # The spatial check does not depend on the temporal relation.
+            if self._check_spatial_topology_entries(spatial_topo_list, spatial_relations) is False:
+                continue
 
+            # The names in temporal_topo_list are already upper case.
             for temporal_topology in temporal_topo_list:
-                if temporal_topology.upper() in temporal_relations.keys():
-                    if self._check_spatial_topology_entries(spatial_topo_list, spatial_relations) is True:
-                        if count_map:
-                            relationmaplist = temporal_relations[temporal_topology.upper()]
-                            gvar = GlobalTemporalVar()
-                            gvar.td = len(relationmaplist)
-                            if "map_value" in dir(map_i):
-                                map_i.map_value.append(gvar)
-                            else:
-                                map_i.map_value = gvar
-                        # Use unique identifier, since map names may be equal
-                        resultdict[map_i.uid] = map_i
-                        # map_i.print_info()
-
-        resultlist = resultdict.values()
+                relationmaplist = temporal_relations.get(temporal_topology)
+                if relationmaplist:
+                    if count_map:
+                        gvar = GlobalTemporalVar()
+                        gvar.td = len(relationmaplist)
+                        if not hasattr(map_i, "map_value"):
+                            map_i.map_value = []
+                        map_i.map_value.append(gvar)
+                    # Use unique identifier, since map names may be equal
+                    if map_i.uid not in resultuids:
+                        resultuids.add(map_i.uid)
+                        resultlist.append(map_i)
+                    # Without counting, a single relation selects the map.
+                    if not count_map:
+                        break
 
         # Sort list of maps chronological.
-        resultlist = sorted(resultlist, key=AbstractDatasetComparisonKeyStartTime)
+        if not presorted:
+            resultlist = sorted(resultlist, key=AbstractDatasetComparisonKeyStartTime)
+
+        return(resultlist)
+
+    def build_numeric_cmd_list(self, maplist, operator, number, map_left=True):
+        """Build the r.mapcalc expressions of an arithmetic operation between
+           the maps of a list and a number, number string or map expression
+
+           :param maplist: List of map objects
+           :param operator: The arithmetic operator (+, -, *, /, %)
+           :param number: The number, number string or map expression
+           :param map_left: True if the maps are the left operand, False
+                            if the number is the left operand
+           :return: List of maps with the updated command strings
+        """
+        resultlist = []
+        for map_i in maplist:
+            # Use the command string of the map if it exists.
+            if hasattr(map_i, "cmd_list"):
+                mapinput = map_i.cmd_list
+            else:
+                mapinput = map_i.get_id()
+            # Create r.mapcalc expression string for the operation.
+            if map_left:
+                cmdstring = "(%s %s %s)" %(mapinput, operator, number)
+            else:
+                cmdstring = "(%s %s %s)" %(number, operator, mapinput)
+            # Conditional append of module command.
+            map_i.cmd_list = cmdstring
+            # Append map to result map list.
+            resultlist.append(map_i)
+            if self.debug:
+                print(map_i.cmd_list)
+
+        return(resultlist)
+
+    def build_function_cmd_list(self, maplist, function):
+        """Build the r.mapcalc expressions that apply a function to each map
+           of a list
+
+           :param maplist: List of map objects
+           :param function: The r.mapcalc function, e.g. sin, isnull, !isnull
+           :return: List of maps with the updated command strings
+        """
+        resultlist = []
+        for map_i in maplist:
+            # Create r.mapcalc expression string for the operation.
+            if hasattr(map_i, "cmd_list"):
+                cmdstring = "%s(%s)" %(function, map_i.cmd_list)
+            else:
+                cmdstring = "%s(%s)" %(function, map_i.get_id())
+            # Set new command list for map.
+            map_i.cmd_list = cmdstring
+            # Append map with updated command list to result list.
+            resultlist.append(map_i)
+            if self.debug:
+                print(map_i.cmd_list)
 
         return(resultlist)
 
@@ -306,6 +399,8 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
 
         :param map_i: map object with temporal extent and built relations.
         :param relmap: map object with defined temporal relation to map_i.
+                       For the operator type this may be a list of map
+                       objects that are joined by the operator.
         :param operator: String representing operator between two spatial variables
                         (&&,||,+,-,*,/).
         :param cmd_type: map object with defined temporal relation to map_i:
@@ -314,34 +409,24 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         :return: the resulting command string for conditionals or spatial variable
             combinations
         """
-        def sub_cmdstring(map_i):
-            """This function search for command string in a map object and
-            return substitute string (contained commandstring or map name)"""
-            if "cmd_list" in dir(map_i):
-                map_sub = map_i.cmd_list
-            elif "map_value" in dir(map_i) and len(map_i.map_value) > 0 and map_i.map_value[0].get_type() == "timediff":
-                map_sub = map_i.map_value[0].get_type_value()[0]
-            else:
-                try:
-                    map_sub = map_i.get_id()
-                except:
-                    map_sub = map_i
-            return(map_sub)
-
         # Check  for type of operation, conditional or spatial variable combination
         # and Create r.mapcalc expression string for the operation.
         cmdstring = ""
         if cmd_type == 'condition':
-            conditionsub = sub_cmdstring(map_i)
-            conclusionsub = sub_cmdstring(relmap)
+            conditionsub = _sub_cmdstring(map_i)
+            conclusionsub = _sub_cmdstring(relmap)
             cmdstring = "if(%s, %s)" %(conditionsub, conclusionsub)
         elif cmd_type == 'conclusion':
-            thensub = sub_cmdstring(map_i)
-            elsesub = sub_cmdstring(relmap)
+            thensub = _sub_cmdstring(map_i)
+            elsesub = _sub_cmdstring(relmap)
             cmdstring = "%s, %s" %(thensub, elsesub)
         elif cmd_type == 'operator':
-            leftsub = sub_cmdstring(map_i)
-            rightsub = sub_cmdstring(relmap)
+            leftsub = _sub_cmdstring(map_i)
+            if isinstance(relmap, list):
+                # Join all related maps in a single flat expression
+                rightsub = (" %s " %(operator)).join([_sub_cmdstring(m) for m in relmap])
+            else:
+                rightsub = _sub_cmdstring(relmap)
             if operator == None:
                 self.msgr.fatal("Error: Can't build command string for map %s, operator is missing"
                     %(map_i.get_map_id()))
@@ -375,11 +460,11 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                     comparison operators.
         """
         # Build command list list with elements from related maps and given relation operator.
-        if convert and "condition_value" in dir(map_i):
+        if convert and hasattr(map_i, "condition_value"):
             if map_i.condition_value != []:
                 cmdstring = str(int(map_i.condition_value[0]))
                 map_i.cmd_list = cmdstring
-        if "cmd_list" in dir(map_i):
+        if hasattr(map_i, "cmd_list"):
             leftcmd = map_i.cmd_list
             cmd_value_list = [leftcmd]
         count = 0
@@ -387,18 +472,18 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         temporal_relations = map_i.get_temporal_relations()
 
         for topo in temporal_topo_list:
-            if topo.upper() in temporal_relations.keys():
-                relationmaplist = temporal_relations[topo.upper()]
-                if count == 0 and "cmd_list" in dir(map_i):
+            relationmaplist = temporal_relations.get(topo.upper())
+            if relationmaplist:
+                if count == 0 and hasattr(map_i, "cmd_list"):
                     cmd_value_list.append(compop)
                     cmd_value_list.append('(')
                 for relationmap in relationmaplist:
                     if self._check_spatial_topology_relation(spatial_topo_list, map_i, relationmap) is True:
-                        if convert and "condition_value" in dir(relationmap):
+                        if convert and hasattr(relationmap, "condition_value"):
                             if relationmap.condition_value != []:
                                 cmdstring = str(int(relationmap.condition_value[0]))
                                 relationmap.cmd_list = cmdstring
-                        if "cmd_list" in dir(relationmap):
+                        if hasattr(relationmap, "cmd_list"):
                             if count > 0:
                                 cmd_value_list.append(aggregate + aggregate)
                             cmd_value_list.append(relationmap.cmd_list)
@@ -436,24 +521,38 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         # Build comandlist list with elements from related maps and given relation operator.
         leftcmd = map_i
         cmdstring = ""
+        # Associative operators are joined in a single flat expression, instead
+        # of nesting the command string once for each related map.
+        fuse = operator in ("+", "*")
+        operandlist = []
         for topo in temporal_topo_list:
-            if topo.upper() in temporal_relations.keys():
-                relationmaplist = temporal_relations[topo.upper()]
+            relationmaplist = temporal_relations.get(topo.upper())
+            if relationmaplist:
                 for relationmap in relationmaplist:
                     if self._check_spatial_topology_relation(spatial_topo_list, map_i, relationmap) is True:
-                        # Create r.mapcalc expression string for the operation.
-                        cmdstring = self.build_command_string(leftcmd,
-                                                              relationmap,
-                                                              operator=operator,
-                                                              cmd_type="operator")
-                        leftcmd = cmdstring
+                        if fuse:
+                            operandlist.append(relationmap)
+                        else:
+                            # Create r.mapcalc expression string for the operation.
+                            cmdstring = self.build_command_string(leftcmd,
+                                                                  relationmap,
+                                                                  operator=operator,
+                                                                  cmd_type="operator")
+                            leftcmd = cmdstring
 
                         if self.debug:
                             print("operator_cmd_value", map_i.get_id(), operator, relationmap.get_id())
+        if operandlist:
+            # Create r.mapcalc expression string for the operation.
+            cmdstring = self.build_command_string(map_i,
+                                                  operandlist,
+                                                  operator=operator,
+                                                  cmd_type="operator")
         # Add command list to result map.
         map_i.cmd_list = cmdstring
 
-        print("map command string", cmdstring)
+        if self.debug:
+            print("map command string", cmdstring)
         return(cmdstring)
 
     def set_temporal_extent_list(self, maplist, topolist=["EQUAL"], temporal='l' ,
@@ -480,18 +579,22 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         for map_i in maplist:
             # Loop over temporal related maps and create overlay modules.
             tbrelations = map_i.get_temporal_relations()
-            # Generate an intermediate map for the result map list.
-            map_new = self.generate_new_map(base_map=map_i,
-                                            bool_op='and',
-                                            copy=True,
-                                            rename=True)
+            # The intermediate map is generated for the first related map.
+            map_new = None
+            returncode = 1
 
             # Combine temporal and spatial extents of intermediate map with related maps.
             for topo in topolist:
-                if topo in tbrelations.keys():
-                    for map_j in (tbrelations[topo]):
+                relationmaplist = tbrelations.get(topo)
+                if relationmaplist:
+                    for map_j in relationmaplist:
                         if self._check_spatial_topology_relation(spatial_topo_list, map_i, map_j) is True:
-                            if temporal == 'r':
+                            if temporal == 'r' or map_new is None:
+                                # Do not generate an intermediate map if
+                                # no spatial overlay exist.
+                                if map_i.spatial_intersection(map_j) is None:
+                                    returncode = 0
+                                    break
                                 # Generate an intermediate map for the result map list.
                                 map_new = self.generate_new_map(base_map=map_i,
                                                                 bool_op='and',
@@ -552,9 +655,15 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         :return: map list with resulting command string for given condition type.
         """
         resultlist = []
+        # Skip the topology builds if there is nothing to select.
+        if not iflist or (not thenlist and not elselist):
+            return(resultlist)
         # First merge conclusion command maplists or strings.
         # Check if alternative conclusion map list is given.
         if all([isinstance(thenlist, list), isinstance(elselist, list)]):
+            # Conclusions require maps in both lists.
+            if not thenlist or not elselist:
+                return(resultlist)
             # Build conclusion command map list.
             conclusiontopolist = self.build_spatio_temporal_topology_list(thenlist, elselist,
                                                                           conclusion_topolist)
@@ -613,7 +722,8 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
             return(resultlist)
         elif isinstance(conclusionlist,  list):
             # Build result command map list between conditions and conclusions.
-            print("build_condition_cmd_list", condition_topolist)
+            if self.debug:
+                print("build_condition_cmd_list", condition_topolist)
             conditiontopolist = self.build_spatio_temporal_topology_list(iflist,
                                                                          conclusionlist,
                                                                          topolist=condition_topolist)
@@ -624,6 +734,8 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                                                        cmd_type="condition")
             return(resultlist)
 
+        return(resultlist)
+
     ###########################################################################
 
     def p_statement_assign(self, t):
@@ -645,11 +757,13 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                     if map_i.is_time_absolute() is True:
                         granularity = compute_absolute_time_granularity(t[3])
 
-                # The first loop is to check if the raster maps exists in the database
+                # The first loop creates the names of the resulting raster maps and
+                # checks if the raster maps exists in the database
                 # Compute the size of the numerical suffix
                 num = len(t[3])
-                register_list = []
                 leadzero = len(str(num))
+                newidents = []
+                newids = []
                 for i in range(num):
                     map_i = t[3][i]
 
@@ -668,42 +782,32 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                         newident = "{ba}_{su}".format(ba=self.basename, su=suffix)
 
                     # Check if resultmap names exist in GRASS database.
-                    newident = newident + "@" + self.mapset
+                    new_id = newident + "@" + self.mapset
+                    newidents.append(newident)
+                    newids.append(new_id)
 
                     if self.stdstype == "strds":
-                        new_map = RasterDataset(newident)
+                        new_map = RasterDataset(new_id)
                     else:
-                        new_map = Raster3DDataset(newident)
+                        new_map = Raster3DDataset(new_id)
                     if new_map.map_exists() and self.overwrite is False:
                         self.msgr.fatal("Error maps with basename %s exist. "
-                                        "Use --o flag to overwrite existing file"%newident)
+                                        "Use --o flag to overwrite existing file"%new_id)
 
                 # The second loop creates the resulting raster maps
-                count = 0
                 map_test_list = []
-                for map_i in t[3]:
+                for i, map_i in enumerate(t[3]):
 
-                    # Create new map with basename
-                    newident = create_numeric_suffix(self.basename, count,
-                                                     "%0" + str(leadzero))
+                    # Use the map name created in the first loop
+                    newident = newidents[i]
+                    new_id = newids[i]
 
-                    if map_i.is_time_absolute() is True and self.time_suffix and \
-                                    granularity is not None and self.time_suffix == 'gran':
-                        suffix = create_suffix_from_datetime(map_i.temporal_extent.get_start_time(),
-                                                             granularity)
-                        newident = "{ba}_{su}".format(ba=self.basename, su=suffix)
-                    # If set use the time suffix to create the map name
-                    elif map_i.is_time_absolute() is True and self.time_suffix and \
-                                    self.time_suffix == 'time':
-                        suffix = create_time_suffix(map_i)
-                        newident = "{ba}_{su}".format(ba=self.basename, su=suffix)
-
-                    if "cmd_list" in dir(map_i):
+                    if hasattr(map_i, "cmd_list"):
                         # Build r.mapcalc module and execute expression.
                         # Change map name to given basename.
                         # Create deepcopy of r.mapcalc module.
 
-                        new_map = map_i.get_new_instance(newident + "@" + self.mapset)
+                        new_map = map_i.get_new_instance(new_id)
                         new_map.set_temporal_extent(map_i.get_temporal_extent())
                         new_map.set_spatial_extent(map_i.get_spatial_extent())
                         map_test_list.append(new_map)
@@ -721,7 +825,7 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
 
                     elif map_i.map_exists():
                         # Copy map if it exists b = a
-                        new_map = map_i.get_new_instance(newident + "@" + self.mapset)
+                        new_map = map_i.get_new_instance(new_id)
                         new_map.set_temporal_extent(map_i.get_temporal_extent())
                         new_map.set_spatial_extent(map_i.get_spatial_extent())
                         map_test_list.append(new_map)
@@ -739,13 +843,12 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
 
                     else:
                         self.msgr.error(_("Error computing map <%s>"%map_i.get_id()))
-                    count += 1
 
                 if self.dry_run is False:
                     process_queue.wait()
 
-                for map_i in map_test_list:
-                    register_list.append(map_i)
+                # All generated maps are registered in the result dataset
+                register_list = map_test_list
 
                 # Open connection to temporal database.
                 dbif, connect = init_dbif(self.dbif)
@@ -756,6 +859,20 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                                                'absolute', t[1], t[1],
                                                'mean', self.dbif,
                                                overwrite = self.overwrite)
+                # The insert and update statements of all maps are gathered and
+                # executed in a single transaction before the registration
+                statement = ""
+                stds_register_list = []
+                # Select the ids of all maps of the current mapset that are
+                # already in the temporal database with a single query
+                ids_in_db = set()
+                if register_list:
+                    sql = "SELECT id FROM " + register_list[0].base.get_table_name() + \
+                          " WHERE mapset = '" + self.mapset + "';\n"
+                    dbif.execute(sql, mapset=self.mapset)
+                    rows = dbif.fetchall(mapset=self.mapset)
+                    if rows:
+                        ids_in_db = set(row[0] for row in rows)
                 for map_i in register_list:
 
                     # Put the map into the process dictionary
@@ -775,30 +892,37 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                                 self.removable_maps[map_i.get_name()] = map_i
                                 continue
 
-                    if map_i.is_in_db(dbif) and self.overwrite:
-                        # Update map in temporal database.
+                    map_in_db = map_i.get_id() in ids_in_db
+                    if map_in_db and self.overwrite:
+                        # Gather the SQL update statement
                         if self.dry_run is False:
-                            map_i.update_all(dbif)
-                    elif map_i.is_in_db(dbif) and self.overwrite is False:
+                            statement += map_i.update_all(dbif, execute=False)
+                    elif map_in_db and self.overwrite is False:
                         # Raise error if map exists and no overwrite flag is given.
                         self.msgr.fatal("Error raster map %s exist in temporal database. "
                                         "Use overwrite flag."%map_i.get_map_id())
                     else:
-                        # Insert map into temporal database.
+                        # Gather the SQL insert statement
                         if self.dry_run is False:
-                            map_i.insert(dbif)
-                    # Register map in result space time dataset.
+                            statement += map_i.insert(dbif, execute=False)
                     if self.dry_run is False:
-                        success = resultstds.register_map(map_i, dbif)
+                        stds_register_list.append(map_i)
 
                 if self.dry_run is False:
+                    # Insert and update the maps in the temporal database.
+                    if statement:
+                        dbif.execute_transaction(statement)
+                    # Register the maps in result space time dataset.
+                    for map_i in stds_register_list:
+                        success = resultstds.register_map(map_i, dbif)
                     resultstds.update_from_registered_maps(dbif)
 
                 self.process_chain_dict["STDS"]["name"] = t[1]
                 self.process_chain_dict["STDS"]["stdstype"] = self.stdstype
                 self.process_chain_dict["STDS"]["temporal_type"] = 'absolute'
 
-                dbif.close()
+                if connect:
+                    dbif.close()
                 t[0] = register_list
                 # Remove intermediate maps
                 self.remove_maps()
@@ -821,18 +945,22 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                     id_input = input
                 else:
                     id_input = input + "@" + self.mapset
-                # Create empty map dataset.
-                map_i = dataset_factory(self.maptype, id_input)
-                # Check for occurrence of space time dataset.
-                if map_i.map_exists() == False:
-                    raise FatalError(_("%s map <%s> not found in GRASS spatial database") %
-                        (map_i.get_type(), id_input))
-                else:
-                    # Select dataset entry from database.
-                    map_i.select(dbif=self.dbif)
-                    # Create command list for map object.
-                    cmdstring = "(%s)" %(map_i.get_map_id())
-                    map_i.cmd_list = cmdstring
+                # Maps that are used several times are only checked once.
+                cmdstring = self.spmap_cmd_strings.get(id_input)
+                if cmdstring is None:
+                    # Create empty map dataset.
+                    map_i = dataset_factory(self.maptype, id_input)
+                    # Check for occurrence of space time dataset.
+                    if map_i.map_exists() == False:
+                        raise FatalError(_("%s map <%s> not found in GRASS spatial database") %
+                            (map_i.get_type(), id_input))
+                    else:
+                        # Select dataset entry from database.
+                        map_i.select(dbif=self.dbif)
+                        # Create command list for map object.
+                        cmdstring = "(%s)" %(map_i.get_map_id())
+                        map_i.cmd_list = cmdstring
+                        self.spmap_cmd_strings[id_input] = cmdstring
             # Return map object.
             t[0] = cmdstring
         else:
@@ -872,7 +1000,8 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         maplistA = self.check_stds(t[1])
         maplistB = self.check_stds(t[3])
 
-        topolist = self.build_spatio_temporal_topology_list(maplistA, maplistB)
+        topolist = self.build_spatio_temporal_topology_list(maplistA, maplistB,
+                                                            presorted=not isinstance(t[1], list))
 
         if self.run:
             resultlist = []
@@ -882,9 +1011,9 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                                                 bool_op='and',
                                                 copy=True)
                 # Loop over temporal related maps and create overlay modules.
-                tbrelations = map_i.get_temporal_relations()
-                count = 0
-                for map_j in (tbrelations['EQUAL']):
+                # Maps without equal related maps are skipped.
+                returncode = 0
+                for map_j in (map_i.get_equal() or []):
                     # Create overlaid map extent.
                     returncode = self.overlay_map_extent(map_new, map_j,
                                                          'and',
@@ -892,30 +1021,20 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                     # Stop the loop if no temporal or spatial relationship exist.
                     if returncode == 0:
                         break
-                    if count == 0:
-                        # Set map name.
-                        name = map_new.get_id()
-                    else:
-                        # Generate an intermediate map
-                        name = self.generate_map_name()
-
                     # Create r.mapcalc expression string for the operation.
                     cmdstring = self.build_command_string(map_i, map_j,
                                                           operator=t[2],
                                                           cmd_type="operator")
                     # Conditional append of module command.
                     map_new.cmd_list = cmdstring
-                    count += 1
                 # Append map to result map list.
                 if returncode == 1:
                     resultlist.append(map_new)
+                    if self.debug:
+                        print(map_new.cmd_list)
 
             t[0] = resultlist
 
-        if self.debug:
-            for map in resultlist:
-                print(map.cmd_list)
-
     def p_arith1_operation_numeric1(self, t):
         # A % 1
         # A / 4
@@ -947,24 +1066,7 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         maplist = self.check_stds(t[1])
 
         if self.run:
-            resultlist = []
-            for map_i in maplist:
-                mapinput = map_i.get_id()
-                # Create r.mapcalc expression string for the operation.
-                if "cmd_list" in dir(map_i):
-                    cmdstring = "(%s %s %s)" %(map_i.cmd_list, t[2], t[3])
-                else:
-                    cmdstring = "(%s %s %s)" %(mapinput, t[2], t[3])
-                # Conditional append of module command.
-                map_i.cmd_list = cmdstring
-                # Append map to result map list.
-                resultlist.append(map_i)
-
-            t[0] = resultlist
-
-        if self.debug:
-            for map in resultlist:
-                print(map.cmd_list)
+            t[0] = self.build_numeric_cmd_list(maplist, t[2], t[3])
 
 
     def p_arith1_operation_numeric2(self, t):
@@ -998,24 +1100,8 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         maplist = self.check_stds(t[3])
 
         if self.run:
-            resultlist = []
-            for map_i in maplist:
-                mapinput = map_i.get_id()
-                # Create r.mapcalc expression string for the operation.
-                if "cmd_list" in dir(map_i):
-                    cmdstring = "(%s %s %s)" %(t[1], t[2], map_i.cmd_list)
-                else:
-                    cmdstring = "(%s %s %s)" %(t[1], t[2], mapinput)
-                # Conditional append of module command.
-                map_i.cmd_list = cmdstring
-                # Append map to result map list.
-                resultlist.append(map_i)
-
-            t[0] = resultlist
-
-        if self.debug:
-            for map in resultlist:
-                print(map.cmd_list)
+            t[0] = self.build_numeric_cmd_list(maplist, t[2], t[1],
+                                               map_left=False)
 
 
     def p_arith2_operation(self, t):
@@ -1041,7 +1127,8 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         # Check input stds.
         maplistA = self.check_stds(t[1])
         maplistB = self.check_stds(t[3])
-        topolist = self.build_spatio_temporal_topology_list(maplistA, maplistB)
+        topolist = self.build_spatio_temporal_topology_list(maplistA, maplistB,
+                                                            presorted=not isinstance(t[1], list))
 
         if self.run:
             resultlist = []
@@ -1052,9 +1139,9 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                                                 copy=True)
 
                 # Loop over temporal related maps and create overlay modules.
-                tbrelations = map_i.get_temporal_relations()
-                count = 0
-                for map_j in (tbrelations['EQUAL']):
+                # Maps without equal related maps are skipped.
+                returncode = 0
+                for map_j in (map_i.get_equal() or []):
                     # Create overlaid map extent.
                     returncode = self.overlay_map_extent(map_new,
                                                          map_j,
@@ -1063,13 +1150,6 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                     # Stop the loop if no temporal or spatial relationship exist.
                     if returncode == 0:
                         break
-                    if count == 0:
-                        # Set map name.
-                        name = map_new.get_id()
-                    else:
-                        # Generate an intermediate map
-                        name = self.generate_map_name()
-
                     # Create r.mapcalc expression string for the operation.
                     cmdstring = self.build_command_string(map_i,
                                                           map_j,
@@ -1077,18 +1157,15 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                                                           cmd_type="operator")
                     # Conditional append of module command.
                     map_new.cmd_list = cmdstring
-                    count += 1
 
                 # Append map to result map list.
                 if returncode == 1:
                     resultlist.append(map_new)
+                    if self.debug:
+                        print(map_new.cmd_list)
 
             t[0] = resultlist
 
-        if self.debug:
-            for map in resultlist:
-                print(map.cmd_list)
-
     def p_arith2_operation_numeric1(self, t):
         # A + 2
         # A - 3
@@ -1112,24 +1189,7 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         maplist = self.check_stds(t[1])
 
         if self.run:
-            resultlist = []
-            for map_i in maplist:
-                mapinput = map_i.get_id()
-                # Create r.mapcalc expression string for the operation.
-                if "cmd_list" in dir(map_i):
-                    cmdstring = "(%s %s %s)" %(map_i.cmd_list, t[2], t[3])
-                else:
-                    cmdstring = "(%s %s %s)" %(mapinput, t[2], t[3])
-                # Conditional append of module command.
-                map_i.cmd_list = cmdstring
-                # Append map to result map list.
-                resultlist.append(map_i)
-
-            t[0] = resultlist
-
-        if self.debug:
-            for map in resultlist:
-                print(map.cmd_list)
+            t[0] = self.build_numeric_cmd_list(maplist, t[2], t[3])
 
     def p_arith2_operation_numeric2(self, t):
         # 2 + A
@@ -1154,24 +1214,8 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         maplist = self.check_stds(t[3])
 
         if self.run:
-            resultlist = []
-            for map_i in maplist:
-                mapinput = map_i.get_id()
-                # Create r.mapcalc expression string for the operation.
-                if "cmd_list" in dir(map_i):
-                    cmdstring = "(%s %s %s)" %(t[1], t[2], map_i.cmd_list)
-                else:
-                    cmdstring = "(%s %s %s)" %(t[1], t[2], mapinput)
-                # Conditional append of module command.
-                map_i.cmd_list = cmdstring
-                # Append map to result map list.
-                resultlist.append(map_i)
-
-            t[0] = resultlist
-
-        if self.debug:
-            for map in resultlist:
-                print(map.cmd_list)
+            t[0] = self.build_numeric_cmd_list(maplist, t[2], t[1],
+                                               map_left=False)
 
     def p_arith1_operation_relation(self, t):
         # A {*, equal, l} B
@@ -1196,7 +1240,8 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                                                                 maplistB,
                                                                 topolist=relations,
                                                                 operator_cmd=True,
-                                                                compop=function)
+                                                                compop=function,
+                                                                presorted=not isinstance(t[1], list))
             # Set temporal extent based on topological relationships.
             resultlist = self.set_temporal_extent_list(complist,
                                                        topolist=relations,
@@ -1231,7 +1276,8 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                                                                 maplistB,
                                                                 topolist=relations,
                                                                 operator_cmd=True,
-                                                                compop=function)
+                                                                compop=function,
+                                                                presorted=not isinstance(t[1], list))
             # Set temporal extent based on topological relationships.
             resultlist = self.set_temporal_extent_list(complist,
                                                        topolist=relations,
@@ -1296,23 +1342,7 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         maplist = self.check_stds(t[3])
 
         if self.run:
-            resultlist = []
-            for map_i in maplist:
-                # Create r.mapcalc expression string for the operation.
-                if "cmd_list" in dir(map_i):
-                    cmdstring = "%s(%s)" %(t[1].lower(), map_i.cmd_list)
-                else:
-                    cmdstring = "%s(%s)" %(t[1].lower(), map_i.get_id())
-                # Set new command list for map.
-                map_i.cmd_list = cmdstring
-                # Append map with updated command list to result list.
-                resultlist.append(map_i)
-
-            t[0] = resultlist
-
-        if self.debug:
-            for map in resultlist:
-                print(map.cmd_list)
+            t[0] = self.build_function_cmd_list(maplist, t[1].lower())
 
     def p_mapexpr_operation(self, t):
         # sin(map(a))
@@ -1340,23 +1370,7 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         maplist = self.check_stds(t[3])
 
         if self.run:
-            resultlist = []
-            for map_i in maplist:
-                # Create r.mapcalc expression string for the operation.
-                if "cmd_list" in dir(map_i):
-                    cmdstring = "%s(%s)" %(t[1].lower(), map_i.cmd_list)
-                else:
-                    cmdstring = "%s(%s)" %(t[1].lower(), map_i.get_id())
-                # Set new command list for map.
-                map_i.cmd_list = cmdstring
-                # Append map with updated command list to result list.
-                resultlist.append(map_i)
-
-            t[0] = resultlist
-
-        if self.debug:
-            for map in resultlist:
-                print(map.cmd_list)
+            t[0] = self.build_function_cmd_list(maplist, t[1].lower())
 
     def p_s_var_expr_2(self, t):
         #   isntnull(A)
@@ -1368,23 +1382,7 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         maplist = self.check_stds(t[3])
 
         if self.run:
-            resultlist = []
-            for map_i in maplist:
-                # Create r.mapcalc expression string for the operation.
-                if "cmd_list" in dir(map_i):
-                    cmdstring = "!isnull(%s)" %(map_i.cmd_list)
-                else:
-                    cmdstring = "!isnull(%s)" %(map_i.get_id())
-                # Set new command list for map.
-                map_i.cmd_list = cmdstring
-                # Append map with updated command list to result list.
-                resultlist.append(map_i)
-
-            t[0] = resultlist
-
-        if self.debug:
-            for map in resultlist:
-                print(map.cmd_list)
+            t[0] = self.build_function_cmd_list(maplist, "!isnull")
 
     def p_s_var_expr_3(self, t):
         #   A <= 2
@@ -1399,7 +1397,7 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
             resultlist = []
             for map_i in maplist:
                 # Create r.mapcalc expression string for the operation.
-                if "cmd_list" in dir(map_i):
+                if hasattr(map_i, "cmd_list"):
                     cmdstring = "%s %s %s" %(map_i.cmd_list, t[2], t[3])
                 else:
                     cmdstring = "%s %s %s" %(map_i.get_id(), t[2], t[3])
@@ -1407,13 +1405,11 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                 map_i.cmd_list = cmdstring
                 # Append map with updated command list to result list.
                 resultlist.append(map_i)
+                if self.debug:
+                    print(map_i.cmd_list)
 
             t[0] = resultlist
 
-        if self.debug:
-            for map in resultlist:
-                print(map.cmd_list)
-
     def p_s_var_expr_4(self, t):
         #   exist(B)
         """
@@ -1426,22 +1422,16 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         if self.run:
             resultlist = []
             for map_i in maplist:
-                # Create r.mapcalc expression string for the operation.
-                if "cmd_list" in dir(map_i):
-                    cmdstring = "%s" %(map_i.cmd_list)
-                else:
-                    cmdstring = "%s" %(map_i.get_id())
-                # Set new command list for map.
-                map_i.cmd_list = cmdstring
+                # The map itself is the r.mapcalc expression string.
+                if not hasattr(map_i, "cmd_list"):
+                    map_i.cmd_list = map_i.get_id()
                 # Append map with updated command list to result list.
                 resultlist.append(map_i)
+                if self.debug:
+                    print(map_i.cmd_list)
 
             t[0] = resultlist
 
-        if self.debug:
-            for map in resultlist:
-                print(map.cmd_list)
-
     def p_s_var_expr_comp(self, t):
         #   A <= 2 || B == 10
         #   A < 3 && A > 1
@@ -1463,7 +1453,8 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                                                                 topolist=relations,
                                                                 compare_cmd=True,
                                                                 compop=function,
-                                                                aggregate=aggregate)
+                                                                aggregate=aggregate,
+                                                                presorted=not isinstance(t[1], list))
             # Set temporal extent based on topological relationships.
             resultlist = self.set_temporal_extent_list(complist,
                                                        topolist=relations,
@@ -1493,7 +1484,8 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                                                                 topolist=relations,
                                                                 compare_cmd=True,
                                                                 compop=function,
-                                                                aggregate=aggregate)
+                                                                aggregate=aggregate,
+                                                                presorted=not isinstance(t[1], list))
             # Set temporal extent based on topological relationships.
             resultlist = self.set_temporal_extent_list(complist,
                                                        topolist=relations,
@@ -1544,7 +1536,7 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         if len(t) == 7:
             numinput = str(t[5])
         elif len(t) == 9:
-            numinput = str(t[5] + t[6] + t[7])
+            numinput = t[5] + t[6] + t[7]
         # Iterate over condition map list.
         for map_i in ifmaplist:
             # Create r.mapcalc expression string for the operation.
@@ -1646,7 +1638,8 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
             numelse = t[9] + t[10] + t[11]
         numthen = str(numthen)
         numelse = str(numelse)
-        print(numthen + " " +numelse )
+        if self.debug:
+            print(numthen + " " + numelse)
         # Create conditional command map list.
         resultlist = self.build_condition_cmd_list(ifmaplist,
                                                    numthen,
@@ -1686,19 +1679,19 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         ifmaplist = self.check_stds(t[3])
         # Select input for r.mapcalc expression based on length of PLY object.
         if len(t) == 9:
-            if isinstance(t[5],  int):
+            if isinstance(t[5], (int, float)):
                 theninput = str(t[5])
                 elseinput = self.check_stds(t[7])
-            elif isinstance(t[7],  int):
+            elif isinstance(t[7], (int, float)):
                 theninput = self.check_stds(t[5])
                 elseinput = str(t[7])
         elif len(t) == 11:
             if t[5] == 'null':
-                theninput = str(t[5] + t[6] + t[7])
+                theninput = t[5] + t[6] + t[7]
                 elseinput = self.check_stds(t[9])
             elif t[7] == 'null':
                 theninput = self.check_stds(t[5])
-                elseinput = str(t[7] + t[8] + t[9])
+                elseinput = t[7] + t[8] + t[9]
 
         # Create conditional command map list.
         resultlist = self.build_condition_cmd_list(ifmaplist,
@@ -1740,19 +1733,19 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         ifmaplist = self.check_stds(t[5])
         # Select input for r.mapcalc expression based on length of PLY object.
         if len(t) == 11:
-            if isinstance(t[7],  int):
+            if isinstance(t[7], (int, float)):
                 theninput = str(t[7])
                 elseinput = self.check_stds(t[9])
-            elif isinstance(t[9],  int):
+            elif isinstance(t[9], (int, float)):
                 theninput = self.check_stds(t[7])
                 elseinput = str(t[9])
         elif len(t) == 13:
             if t[7] == 'null':
-                theninput = str(t[7] + t[8] + t[9])
+                theninput = t[7] + t[8] + t[9]
                 elseinput = self.check_stds(t[11])
             elif t[9] == 'null':
                 theninput = self.check_stds(t[7])
-                elseinput = str(t[9] + t[10] + t[11])
+                elseinput = t[9] + t[10] + t[11]
 
         # Create conditional command map list.
         resultlist = self.build_condition_cmd_list(ifmaplist,
@@ -1837,7 +1830,8 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                                                                 compare_cmd=True,
                                                                 compop=function,
                                                                 aggregate=aggregate,
-                                                                convert=True)
+                                                                convert=True,
+                                                                presorted=not isinstance(t[1], list))
             # Set temporal extent based on topological relationships.
             resultlist = self.set_temporal_extent_list(complist,
                                                        topolist=relations,
@@ -1859,23 +1853,24 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         if self.run:
             resultlist = []
             for map_i in maplist:
-                for obj in map_i.map_value:
+                # The number of related maps is the last temporal variable
+                # assigned to the map.
+                n_maps = 0
+                for obj in reversed(map_i.map_value):
                     if isinstance(obj, GlobalTemporalVar):
                         n_maps = obj.td
-                mapinput = map_i.get_id()
+                        break
                 # Create r.mapcalc expression string for the operation.
                 cmdstring = "(%s)" %(n_maps)
                  # Append module command.
                 map_i.cmd_list = cmdstring
                 # Append map to result map list.
                 resultlist.append(map_i)
+                if self.debug:
+                    print(map_i.cmd_list)
 
             t[0] = resultlist
 
-        if self.debug:
-            for map in resultlist:
-                print(map.cmd_list)
-
 ###############################################################################
 
 if __name__ == "__main__":
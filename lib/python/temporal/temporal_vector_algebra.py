@@ -136,19 +136,18 @@ class TemporalVectorAlgebraParser(TemporalAlgebraParser):
 
     def parse(self, expression, basename = None, overwrite = False):
         # Check for space time dataset type definitions from temporal algebra
-        l = TemporalVectorAlgebraLexer()
-        l.build()
-        l.lexer.input(expression)
+        self.lexer = TemporalVectorAlgebraLexer()
+        self.lexer.build()
+        self.lexer.lexer.input(expression)
 
         while True:
-            tok = l.lexer.token()
+            tok = self.lexer.lexer.token()
             if not tok: break
 
             if tok.type == "STVDS" or tok.type == "STRDS" or tok.type == "STR3DS":
                 raise SyntaxError("Syntax error near '%s'" %(tok.type))
 
-        self.lexer = TemporalVectorAlgebraLexer()
-        self.lexer.build()
+        # The parser resets the lexer input, so the lexer is reused
         self.parser = yacc.yacc(module=self, debug=self.debug, write_tables=False)
 
         self.overwrite = overwrite
@@ -165,7 +164,8 @@ class TemporalVectorAlgebraParser(TemporalAlgebraParser):
     def build_spatio_temporal_topology_list(self, maplistA, maplistB = None, topolist = ["EQUAL"],
                                             assign_val = False, count_map = False, compare_bool = False,
                                             compare_cmd = False, compop = None, aggregate = None,
-                                            new = False, convert = False, overlay_cmd = False):
+                                            new = False, convert = False, overlay_cmd = False,
+                                            presorted = False):
         """Build temporal topology for two space time data sets, copy map objects
           for given relation into map list.
 
@@ -188,6 +188,8 @@ class TemporalVectorAlgebraParser(TemporalAlgebraParser):
                         r.mapcalc command strings.
           :param overlay_cmd: Boolean for aggregate overlay operators implicitly
                         in command list values based on related map lists.
+          :param presorted: Boolean if maplistA is already sorted by start time,
+                        the resulting map list will not be sorted again.
 
           :return: List of maps from maplistA that fulfil the topological relationships
                   to maplistB specified in topolist.
@@ -201,7 +203,8 @@ class TemporalVectorAlgebraParser(TemporalAlgebraParser):
                           "CONTAINS" : "DURING", "STARTS" : "STARTED",
                           "STARTED" : "STARTS", "FINISHES" : "FINISHED",
                           "FINISHED" : "FINISHES"}
-        resultdict = {}
+        resultlist = []
+        resultuids = set()
         # Check if given temporal relation are valid.
         for topo in topolist:
           if topo.upper() not in topologylist:
@@ -236,16 +239,17 @@ class TemporalVectorAlgebraParser(TemporalAlgebraParser):
                         relationmaplist = tbrelations[topo.upper()]
                         gvar = GlobalTemporalVar()
                         gvar.td = len(relationmaplist)
-                        if "map_value" in dir(map_i):
-                            map_i.map_value.append(gvar)
-                        else:
-                            map_i.map_value = gvar
+                        if not hasattr(map_i, "map_value"):
+                            map_i.map_value = []
+                        map_i.map_value.append(gvar)
                     # Use unique identifier, since map names may be equal
-                    resultdict[map_i.uid] = map_i
-        resultlist = resultdict.values()
+                    if map_i.uid not in resultuids:
+                        resultuids.add(map_i.uid)
+                        resultlist.append(map_i)
 
         # Sort list of maps chronological.
-        resultlist = sorted(resultlist, key = AbstractDatasetComparisonKeyStartTime)
+        if not presorted:
+            resultlist = sorted(resultlist, key = AbstractDatasetComparisonKeyStartTime)
 
         return(resultlist)
 
@@ -268,14 +272,14 @@ class TemporalVectorAlgebraParser(TemporalAlgebraParser):
         # Set first input for overlay module.
         mapainput = map_i.get_id()
         # Append command list of given map to result command list.
-        if "cmd_list" in dir(map_i):
+        if hasattr(map_i, "cmd_list"):
             resultlist = resultlist + map_i.cmd_list
         for topo in topolist:
             if topo.upper() in tbrelations.keys():
                 relationmaplist = tbrelations[topo.upper()]
                 for relationmap in relationmaplist:
                     # Append command list of given map to result command list.
-                    if "cmd_list" in dir(relationmap):
+                    if hasattr(relationmap, "cmd_list"):
                         resultlist = resultlist + relationmap.cmd_list
                     # Generate an intermediate name
                     name = self.generate_map_name()
@@ -388,7 +392,7 @@ class TemporalVectorAlgebraParser(TemporalAlgebraParser):
                                           "Use --o flag to overwrite existing file") \
                                           %(vectorname))
                 for map_i in t[3]:
-                    if "cmd_list" in dir(map_i):
+                    if hasattr(map_i, "cmd_list"):
                         # Execute command list.
                         for cmd in map_i.cmd_list:
                             try:
@@ -542,7 +546,8 @@ class TemporalVectorAlgebraParser(TemporalAlgebraParser):
             function = t[2]
             # Build command list for related maps.
             complist = self.build_spatio_temporal_topology_list(maplistA, maplistB, topolist = relations,
-                                                                compop = function, overlay_cmd = True)
+                                                                compop = function, overlay_cmd = True,
+                                                                presorted = not isinstance(t[1], list))
             # Set temporal extent based on topological relationships.
             resultlist = self.set_temporal_extent_list(complist, topolist = relations,
                                 temporal = temporal)
@@ -565,7 +570,8 @@ class TemporalVectorAlgebraParser(TemporalAlgebraParser):
             relations, temporal, function,  aggregate = self.eval_toperator(t[2],  optype = 'overlay')
             # Build command list for related maps.
             complist = self.build_spatio_temporal_topology_list(maplistA, maplistB, topolist = relations,
-                                                                compop = function, overlay_cmd = True)
+                                                                compop = function, overlay_cmd = True,
+                                                                presorted = not isinstance(t[1], list))
             # Set temporal extent based on topological relationships.
             resultlist = self.set_temporal_extent_list(complist, topolist = relations,
                                 temporal = temporal)
@@ -608,7 +614,7 @@ class TemporalVectorAlgebraParser(TemporalAlgebraParser):
                 m.flags["overwrite"].value = self.overwrite
 
                 # Conditional append of module command.
-                if "cmd_list" in dir(map_new):
+                if hasattr(map_new, "cmd_list"):
                     map_new.cmd_list.append(m)
                 else:
                     map_new.cmd_list = [m]
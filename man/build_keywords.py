@@ -5,6 +5,7 @@
 # (c) 2013 by the GRASS Development Team, Luca Delucchi
 
 import os
+import re
 import sys
 import glob
 from build_html import *
@@ -21,21 +22,20 @@ htmlfiles = glob.glob1(path, '*.html')
 
 char_list = {}
 
+# the keywords are on the first non-empty line after the KEYWORDS header
+keywords_re = re.compile(r'^<h2>KEYWORDS</h2>\n\n*(.+)', re.MULTILINE)
+name_re = re.compile(r'^<h2>NAME</h2>\n', re.MULTILINE)
+
 for fname in htmlfiles:
     fil = open(os.path.join(path, fname))
-    # TODO maybe move to Python re (regex)
-    lines = fil.readlines()
-    # remove empty lines
-    lines = [x for x in lines if x != '\n']
-    try:
-        index_keys = lines.index('<h2>KEYWORDS</h2>\n') + 1
-        index_desc = lines.index('<h2>NAME</h2>\n') + 1
-    except:
-        continue
-    try:
-        keys = lines[index_keys].split(',')
-    except:
+    content = fil.read()
+    fil.close()
+    # skip pages without keywords or name section
+    match = keywords_re.search(content)
+    if not match or not name_re.search(content):
         continue
+    keys_line = match.group(1)
+    keys = keys_line.split(',')
     for key in keys:
         key = key.strip()
         try:
@@ -44,12 +44,10 @@ for fname in htmlfiles:
             pass
         if not key:
             exit("Empty keyword from file %s line: %s"
-                 % (fname, lines[index_keys]))
-        if key not in keywords.keys():
-            keywords[key] = []
-            keywords[key].append(fname)
-        elif fname not in keywords[key]:
-            keywords[key].append(fname)
+                 % (fname, keys_line))
+        fnames = keywords.setdefault(key, [])
+        if fname not in fnames:
+            fnames.append(fname)
 
 for black in blacklist:
     try:
@@ -64,9 +62,9 @@ for key in sorted(keywords.keys()):
     # this list it is useful to create the TOC using only the first
     # character for keyword
     firstchar = key[0].lower()
-    if firstchar not in char_list.keys():
+    if firstchar not in char_list:
         char_list[str(firstchar)] = key
-    elif firstchar in char_list.keys():
+    else:
         if key.lower() < char_list[str(firstchar)].lower():
             char_list[str(firstchar.lower())] = key
 
@@ -91,7 +89,7 @@ keywordsfile.write("</dl>\n")
 # create toc
 toc = '<div class="toc">\n<h4 class="toc">Table of contents</h4><p class="toc">'
 test_length = 0
-all_keys = len(char_list.keys())
+all_keys = len(char_list)
 for k in sorted(char_list.keys()):
     test_length += 1
 #    toc += '<li><a href="#%s" class="toc">%s</a></li>' % (char_list[k], k)
@@ -98,7 +98,6 @@ cols: 3
 
 class TestR3ToRast(TestCase):
     # TODO: replace by unified handing of maps
-    # mixing class and object attributes
     to_remove_3d = []
     to_remove_2d = []
     rast3d = 'r3_to_rast_test_a_b_coeff'
@@ -106,28 +105,31 @@ class TestR3ToRast(TestCase):
     rast2d_ref = 'r3_to_rast_test_a_b_coeff_ref'
     rast2d_refs = []
 
-    def setUp(self):
-        self.use_temp_region()
-        self.runModule('r3.in.ascii', input='-', stdin_=INPUT,
-                       output=self.rast3d)
-        self.to_remove_3d.append(self.rast3d)
-        self.runModule('g.region', raster_3d=self.rast3d)
+    @classmethod
+    def setUpClass(cls):
+        """Import the 3D input and the 2D reference rasters once"""
+        cls.use_temp_region()
+        cls.runModule('r3.in.ascii', input='-', stdin_=INPUT,
+                      output=cls.rast3d)
+        cls.to_remove_3d.append(cls.rast3d)
+        cls.runModule('g.region', raster_3d=cls.rast3d)
 
         for i, data in enumerate(OUTPUTS):
-            rast = "%s_%d" % (self.rast2d_ref, i)
-            self.runModule('r.in.ascii', input='-', stdin_=data,
-                           output=rast)
-            self.to_remove_2d.append(rast)
-            self.rast2d_refs.append(rast)
+            rast = "%s_%d" % (cls.rast2d_ref, i)
+            cls.runModule('r.in.ascii', input='-', stdin_=data,
+                          output=rast)
+            cls.to_remove_2d.append(rast)
+            cls.rast2d_refs.append(rast)
 
-    def tearDown(self):
-        if self.to_remove_3d:
-            self.runModule('g.remove', flags='f', type='raster_3d',
-                           name=','.join(self.to_remove_3d), verbose=True)
-        if self.to_remove_2d:
-            self.runModule('g.remove', flags='f', type='raster',
-                           name=','.join(self.to_remove_2d), verbose=True)
-        self.del_temp_region()
+    @classmethod
+    def tearDownClass(cls):
+        if cls.to_remove_3d:
+            cls.runModule('g.remove', flags='f', type='raster_3d',
+                          name=','.join(cls.to_remove_3d), verbose=True)
+        if cls.to_remove_2d:
+            cls.runModule('g.remove', flags='f', type='raster',
+                          name=','.join(cls.to_remove_2d), verbose=True)
+        cls.del_temp_region()
 
     def test_a_b_coeff(self):
         self.assertModule('r3.to.rast', input=self.rast3d,
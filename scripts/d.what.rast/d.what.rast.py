@@ -33,10 +33,9 @@ def main():
         cmd_file = gcore.parse_command('d.mon', flags='g').get('cmd', None)
         if not cmd_file:
             gcore.fatal(_("Unable to open file '%s'") % cmd_file)
-        dout_cmd = 'd.what.rast'
-        for param, val in options.items():
-            if val:
-                dout_cmd += " {param}={val}".format(param=param, val=val)
+        params = ["{param}={val}".format(param=param, val=val)
+                  for param, val in options.items() if val]
+        dout_cmd = ' '.join(['d.what.rast'] + params)
         with open(cmd_file, "a") as file_:
             file_.write(dout_cmd)
     else:
@@ -101,6 +101,7 @@ except ImportError:
     hasNumPy = False
 
 import grass.script as grass
+from grass.script.utils import decode
 
 
 def main():
@@ -119,7 +120,7 @@ def main():
     rescale   = flags['r'] # rescale to spread pixel values to entire 0-255 range
 
     # Checking bit depth
-    bits = float(bits)
+    bits = int(bits)
     if bits < 2 or bits > 30:
         grass.warning(_("Bit depth is outside acceptable range"))
         return
@@ -141,108 +142,42 @@ def main():
     ms3 = 'tmp%s_ms3' % pid
     pan = 'tmp%s_pan' % pid
 
+    channels = [(ms1_orig, ms1), (ms2_orig, ms2), (ms3_orig, ms3),
+                (pan_orig, pan)]
+    # r.info output of the input channels
+    infos = {}
+
     if rescale == False:
         if bits == 8:
             grass.message(_("Using 8bit image channels"))
-            if sproc:
-                # serial processing
-                grass.run_command('g.copy', raster='%s,%s' % (ms1_orig, ms1),
-                                   quiet=True, overwrite=True)
-                grass.run_command('g.copy', raster='%s,%s' % (ms2_orig, ms2),
-                                   quiet=True, overwrite=True)
-                grass.run_command('g.copy', raster='%s,%s' % (ms3_orig, ms3),
-                                   quiet=True, overwrite=True)
-                grass.run_command('g.copy', raster='%s,%s' % (pan_orig, pan),
-                                   quiet=True, overwrite=True)
-            else:
-                # parallel processing
-                pb = grass.start_command('g.copy', raster='%s,%s' % (ms1_orig, ms1),
-                                       quiet=True, overwrite=True)
-                pg = grass.start_command('g.copy', raster='%s,%s' % (ms2_orig, ms2),
-                                       quiet=True, overwrite=True)
-                pr = grass.start_command('g.copy', raster='%s,%s' % (ms3_orig, ms3),
-                                       quiet=True, overwrite=True)
-                pp = grass.start_command('g.copy', raster='%s,%s' % (pan_orig, pan),
-                                       quiet=True, overwrite=True)
-
-                pb.wait()
-                pg.wait()
-                pr.wait()
-                pp.wait()
+            # the input channels are only read, no need to copy them
+            ms1, ms2, ms3, pan = ms1_orig, ms2_orig, ms3_orig, pan_orig
+            commands = []
 
         else:
             grass.message(_("Converting image chanels to 8bit for processing"))
-            maxval = pow(2, bits) - 1
-            if sproc:
-                # serial processing
-                grass.run_command('r.rescale', input=ms1_orig, from_='0,%f' % maxval,
-                                   output=ms1, to='0,255', quiet=True, overwrite=True)
-                grass.run_command('r.rescale', input=ms2_orig, from_='0,%f' % maxval,
-                                   output=ms2, to='0,255', quiet=True, overwrite=True)
-                grass.run_command('r.rescale', input=ms3_orig, from_='0,%f' % maxval,
-                                   output=ms3, to='0,255', quiet=True, overwrite=True)
-                grass.run_command('r.rescale', input=pan_orig, from_='0,%f' % maxval,
-                                   output=pan, to='0,255', quiet=True, overwrite=True)
-
-            else:
-                # parallel processing
-                pb = grass.start_command('r.rescale', input=ms1_orig, from_='0,%f' % maxval,
-                                       output=ms1, to='0,255', quiet=True, overwrite=True)
-                pg = grass.start_command('r.rescale', input=ms2_orig, from_='0,%f' % maxval,
-                                       output=ms2, to='0,255', quiet=True, overwrite=True)
-                pr = grass.start_command('r.rescale', input=ms3_orig, from_='0,%f' % maxval,
-                                       output=ms3, to='0,255', quiet=True, overwrite=True)
-                pp = grass.start_command('r.rescale', input=pan_orig, from_='0,%f' % maxval,
-                                       output=pan, to='0,255', quiet=True, overwrite=True)
-
-                pb.wait()
-                pg.wait()
-                pr.wait()
-                pp.wait()
+            maxval = (1 << bits) - 1
+            commands = [('r.rescale', dict(input=orig, from_='0,%d' % maxval,
+                                           output=tmp, to='0,255'))
+                        for orig, tmp in channels]
 
     else:
         grass.message(_("Rescaling image chanels to 8bit for processing"))
 
-        min_ms1 = int(grass.raster_info(ms1_orig)['min'])
-        max_ms1 = int(grass.raster_info(ms1_orig)['max'])
-        min_ms2 = int(grass.raster_info(ms2_orig)['min'])
-        max_ms2 = int(grass.raster_info(ms2_orig)['max'])
-        min_ms3 = int(grass.raster_info(ms3_orig)['min'])
-        max_ms3 = int(grass.raster_info(ms3_orig)['max'])
-        min_pan = int(grass.raster_info(pan_orig)['min'])
-        max_pan = int(grass.raster_info(pan_orig)['max'])
-
-        maxval = pow(2, bits) - 1
-        if sproc:
-            # serial processing
-            grass.run_command('r.rescale', input=ms1_orig, from_='%f,%f' % (min_ms1, max_ms1),
-                               output=ms1, to='0,255', quiet=True, overwrite=True)
-            grass.run_command('r.rescale', input=ms2_orig, from_='%f,%f' % (min_ms2, max_ms2),
-                               output=ms2, to='0,255', quiet=True, overwrite=True)
-            grass.run_command('r.rescale', input=ms3_orig, from_='%f,%f' % (min_ms3, max_ms3),
-                               output=ms3, to='0,255', quiet=True, overwrite=True)
-            grass.run_command('r.rescale', input=pan_orig, from_='%f,%f' % (min_pan, max_pan),
-                               output=pan, to='0,255', quiet=True, overwrite=True)
+        commands = []
+        for orig, tmp in channels:
+            kv = infos[orig] = grass.raster_info(orig)
+            commands.append(('r.rescale',
+                             dict(input=orig,
+                                  from_='%d,%d' % (int(kv['min']), int(kv['max'])),
+                                  output=tmp, to='0,255')))
 
-        else:
-            # parallel processing
-            pb = grass.start_command('r.rescale', input=ms1_orig, from_='%f,%f' % (min_ms1, max_ms1),
-                                   output=ms1, to='0,255', quiet=True, overwrite=True)
-            pg = grass.start_command('r.rescale', input=ms2_orig, from_='%f,%f' % (min_ms2, max_ms2),
-                                   output=ms2, to='0,255', quiet=True, overwrite=True)
-            pr = grass.start_command('r.rescale', input=ms3_orig, from_='%f,%f' % (min_ms3, max_ms3),
-                                   output=ms3, to='0,255', quiet=True, overwrite=True)
-            pp = grass.start_command('r.rescale', input=pan_orig, from_='%f,%f' % (min_pan, max_pan),
-                                   output=pan, to='0,255', quiet=True, overwrite=True)
-
-            pb.wait()
-            pg.wait()
-            pr.wait()
-            pp.wait()
-
-
-    # get PAN resolution:
-    kv = grass.raster_info(map=pan)
+    run_channel_commands(commands, sproc)
+
+    # get PAN resolution, the 8bit version shares the header of the input
+    if pan_orig not in infos:
+        infos[pan_orig] = grass.raster_info(map=pan_orig)
+    kv = infos[pan_orig]
     nsres = kv['nsres']
     ewres = kv['ewres']
     panres = (nsres + ewres) / 2
@@ -265,9 +200,9 @@ def main():
 
     # equalized grey scales give best contrast
     grass.message(_("setting pan-sharpened channels to equalized grey scale"))
-    for ch in ['red', 'green', 'blue']:
-        grass.run_command('r.colors', quiet=True, map="%s_%s" % (out, ch),
-                          flags="e", color='grey')
+    run_channel_commands([('r.colors', dict(map="%s_%s" % (out, ch),
+                                            flags="e", color='grey'))
+                          for ch in ['red', 'green', 'blue']], sproc)
 
     # Landsat too blue-ish because panchromatic band less sensitive to blue
     # light, so output blue channed can be modified
@@ -306,6 +241,22 @@ def main():
     except:
         ""
 
+def run_channel_commands(commands, sproc):
+    """Run the (module, options) commands for the image channels, serially
+    or in parallel"""
+    if sproc:
+        # serial processing
+        for module, kwargs in commands:
+            grass.run_command(module, quiet=True, overwrite=True, **kwargs)
+    else:
+        # parallel processing
+        procs = [grass.start_command(module, quiet=True, overwrite=True,
+                                     **kwargs)
+                 for module, kwargs in commands]
+        for proc in procs:
+            proc.wait()
+
+
 def brovey(pan, ms1, ms2, ms3, out, pid, sproc):
     grass.verbose(_("Using Brovey algorithm"))
 
@@ -339,13 +290,13 @@ def brovey(pan, ms1, ms2, ms3, out, pid, sproc):
                       overwrite=True)
     else:
         # parallel processing
-        pb = grass.mapcalc_start('%s_blue = 1 * round((%s * %s) / (%s + %s + %s))' %
+        pb = grass.mapcalc_start('%s_blue = 1 * round(("%s" * "%s") / ("%s" + "%s" + "%s"))' %
                                  (out, ms1, panmatch1, ms1, ms2, ms3),
                                  overwrite=True)
-        pg = grass.mapcalc_start('%s_green = 1 * round((%s * %s) / (%s + %s + %s))' %
+        pg = grass.mapcalc_start('%s_green = 1 * round(("%s" * "%s") / ("%s" + "%s" + "%s"))' %
                                  (out, ms2, panmatch2, ms1, ms2, ms3),
                                  overwrite=True)
-        pr = grass.mapcalc_start('%s_red = 1 * round((%s * %s) / (%s + %s + %s))' %
+        pr = grass.mapcalc_start('%s_red = 1 * round(("%s" * "%s") / ("%s" + "%s" + "%s"))' %
                                  (out, ms3, panmatch3, ms1, ms2, ms3),
                                  overwrite=True)
 
@@ -457,77 +408,37 @@ def pca(pan, ms1, ms2, ms3, out, pid, sproc):
     b2mean = float(stats2['mean'])
     b3mean = float(stats3['mean'])
 
-    if sproc:
-        # serial processing
-        outr = '%s_red' % out
-        outg = '%s_green' % out
-        outb = '%s_blue' % out
-
-        cmd1 = "$outb = 1 * round(($panmatch1 * $b1evect1) + ($pca2 * $b1evect2) + ($pca3 * $b1evect3) + $b1mean)"
-        cmd2 = "$outg = 1 * round(($panmatch2 * $b2evect1) + ($pca2 * $b2evect2) + ($pca3 * $b2evect3) + $b2mean)"
-        cmd3 = "$outr = 1 * round(($panmatch3 * $b3evect1) + ($pca2 * $b3evect2) + ($pca3 * $b3evect3) + $b3mean)"
-
-        cmd = '\n'.join([cmd1, cmd2, cmd3])
-
-        grass.mapcalc(cmd, outb=outb, outg=outg, outr=outr,
-                      panmatch1=panmatch1,
-                      panmatch2=panmatch2,
-                      panmatch3=panmatch3,
-                      pca2=pca2,
-                      pca3=pca3,
-                      b1evect1=b1evect1,
-                      b2evect1=b2evect1,
-                      b3evect1=b3evect1,
-                      b1evect2=b1evect2,
-                      b2evect2=b2evect2,
-                      b3evect2=b3evect2,
-                      b1evect3=b1evect3,
-                      b2evect3=b2evect3,
-                      b3evect3=b3evect3,
-                      b1mean=b1mean,
-                      b2mean=b2mean,
-                      b3mean=b3mean,
-                      overwrite=True)
-    else:
-        # parallel processing
-        pb = grass.mapcalc_start('%s_blue = 1 * round((%s * %f) + (%s * %f) + (%s * %f) + %f)'
-                                 % (out,
-                                    panmatch1,
-                                    b1evect1,
-                                    pca2,
-                                    b1evect2,
-                                    pca3,
-                                    b1evect3,
-                                    b1mean),
-                                 overwrite=True)
-
-        pg = grass.mapcalc_start('%s_green = 1 * round((%s * %f) + (%s * %f) + (%s * %f) + %f)'
-                                 % (out,
-                                    panmatch2,
-                                    b2evect1,
-                                    pca2,
-                                    b2evect2,
-                                    pca3,
-                                    b2evect3,
-                                    b2mean),
-                                 overwrite=True)
-
-        pr = grass.mapcalc_start('%s_red = 1 * round((%s * %f) + (%s * %f) + (%s * %f) + %f)'
-                                 % (out,
-                                    panmatch3,
-                                    b3evect1,
-                                    pca2,
-                                    b3evect2,
-                                    pca3,
-                                    b3evect3,
-                                    b3mean),
-                                 overwrite=True)
+    # a single r.mapcalc run reads the shared pca2 and pca3 rows only once
+    #   for all three output channels
+    outr = '%s_red' % out
+    outg = '%s_green' % out
+    outb = '%s_blue' % out
 
-        pb.wait(), pg.wait(), pr.wait()
-        try:
-            pb.terminate(), pg.terminate(), pr.terminate()
-        except:
-            ""
+    cmd1 = "$outb = 1 * round(($panmatch1 * $b1evect1) + ($pca2 * $b1evect2) + ($pca3 * $b1evect3) + $b1mean)"
+    cmd2 = "$outg = 1 * round(($panmatch2 * $b2evect1) + ($pca2 * $b2evect2) + ($pca3 * $b2evect3) + $b2mean)"
+    cmd3 = "$outr = 1 * round(($panmatch3 * $b3evect1) + ($pca2 * $b3evect2) + ($pca3 * $b3evect3) + $b3mean)"
+
+    cmd = '\n'.join([cmd1, cmd2, cmd3])
+
+    grass.mapcalc(cmd, outb=outb, outg=outg, outr=outr,
+                  panmatch1=panmatch1,
+                  panmatch2=panmatch2,
+                  panmatch3=panmatch3,
+                  pca2=pca2,
+                  pca3=pca3,
+                  b1evect1=b1evect1,
+                  b2evect1=b2evect1,
+                  b3evect1=b3evect1,
+                  b1evect2=b1evect2,
+                  b2evect2=b2evect2,
+                  b3evect2=b3evect2,
+                  b1evect3=b1evect3,
+                  b2evect3=b2evect3,
+                  b3evect3=b3evect3,
+                  b1mean=b1mean,
+                  b2mean=b2mean,
+                  b3mean=b3mean,
+                  overwrite=True)
 
     # Cleanup
     grass.run_command('g.remove', flags='f', quiet=True, type='raster',
@@ -538,91 +449,62 @@ def matchhist(original, target, matched):
     grass.message(_("Histogram matching..."))
 
     # input images
-    original = original.split('@')[0]
-    target = target.split('@')[0]
     images = [original, target]
 
     # create a dictionary to hold arrays for each image
     arrays = {}
 
+    # calculate number of cells for each grey value for for each image,
+    #   r.stats is started for all images before reading the output
+    procs = dict((img, grass.pipe_command('r.stats', flags='cin', input=img,
+                                          sep=':'))
+                 for img in images)
+
     for img in images:
-        # calculate number of cells for each grey value for for each image
-        stats_out = grass.pipe_command('r.stats', flags='cin', input=img,
-                                       sep=':')
-        stats = stats_out.communicate()[0].split('\n')[:-1]
-        stats_dict = dict(s.split(':', 1) for s in stats)
+        stats_out = procs[img]
+
+        # number of cells of the grey values 0-255
+        num_cells = np.zeros((256, ), dtype=np.int64)
         total_cells = 0  # total non-null cells
-        for j in stats_dict:
-            stats_dict[j] = int(stats_dict[j])
-            if j != '*':
-                total_cells += stats_dict[j]
+        for line in stats_out.stdout:
+            grey, count = decode(line).split(':', 1)
+            if grey == '*':
+                continue
+            count = int(count)
+            total_cells += count
+            grey = int(grey)
+            if 0 <= grey < 256:
+                num_cells[grey] = count
+        stats_out.wait()
 
         if total_cells < 1:
             grass.fatal(_("Input has no data. Check region settings."))
 
-        # Make a 2x256 structured array for each image with a
-        #   cumulative distribution function (CDF) for each grey value.
-        #   Grey value is the integer (i4) and cdf is float (f4).
-
-        arrays[img] = np.zeros((256, ), dtype=('i4,f4'))
-        cum_cells = 0  # cumulative total of cells for sum of current and all lower grey values
-
-        for n in range(0, 256):
-            if str(n) in stats_dict:
-                num_cells = stats_dict[str(n)]
-            else:
-                num_cells = 0
-
-            cum_cells += num_cells
-
-            # cdf is the the number of cells at or below a given grey value
-            #   divided by the total number of cells
-            cdf = float(cum_cells) / float(total_cells)
-
-            # insert values into array
-            arrays[img][n] = (n, cdf)
-
-    # open file for reclass rules
-    outfile = open(grass.tempfile(), 'w')
-
-    for i in arrays[original]:
-        # for each grey value and corresponding cdf value in original, find the
-        #   cdf value in target that is closest to the target cdf value
-        difference_list = []
-        for j in arrays[target]:
-            # make a list of the difference between each original cdf value and
-            #   the target cdf value
-            difference_list.append(abs(i[1] - j[1]))
-
-        # get the smallest difference in the list
-        min_difference = min(difference_list)
-
-        for j in arrays[target]:
-            # find the grey value in target that corresponds to the cdf
-            #   closest to the original cdf
-            if j[1] <= i[1] + min_difference and j[1] >= i[1] - min_difference:
-                # build a reclass rules file from the original grey value and
-                #   corresponding grey value from target
-                out_line = "%d = %d\n" % (i[0], j[0])
-                outfile.write(out_line)
-                break
-
-    outfile.close()
-
-    # create reclass of target from reclass rules file
+        # Make an array for each image with the cumulative distribution
+        #   function (CDF) of the grey values 0-255: the number of cells at or
+        #   below a given grey value divided by the total number of cells.
+        #   The array index is the grey value.
+        arrays[img] = (np.cumsum(num_cells) / float(total_cells)).astype(np.float32)
+
+    # for each grey value in original, find the grey value in target with the
+    #   cdf value that is closest to the original cdf value
+    difference = np.abs(arrays[original][:, np.newaxis] -
+                        arrays[target][np.newaxis, :])
+    # argmin returns the lowest grey value in case of equal differences
+    matches = difference.argmin(axis=1)
+
+    # build the reclass rules from the original grey value and
+    #   corresponding grey value from target
+    rules = ''.join("%d = %d\n" % (grey, match)
+                    for grey, match in enumerate(matches))
+
+    # create reclass of target from the reclass rules
     result = grass.core.find_file(matched, element='cell')
     if result['fullname']:
         grass.run_command('g.remove', flags='f', quiet=True, type='raster',
                           name=matched)
-        grass.run_command('r.reclass', input=original, out=matched,
-                          rules=outfile.name)
-    else:
-        grass.run_command('r.reclass', input=original, out=matched,
-                          rules=outfile.name)
-
-    # Cleanup
-    # remove the rules file
-    grass.try_remove(outfile.name)
+    grass.write_command('r.reclass', input=original, out=matched,
+                        rules='-', stdin=rules)
 
     # return reclass of target with histogram that matches original
     return matched
@@ -80,7 +80,8 @@
 
 import os
 import atexit
-from grass.script.utils import try_rmdir
+import tempfile
+from grass.script.utils import try_rmdir, decode
 from grass.script import core as gcore
 
 
@@ -89,12 +90,9 @@ def cleanup():
 
 
 def write2textf(what, output):
-    outf = open(output, 'w')
-    i = 0
-    for row in enumerate(what):
-        i = i + 1
-        outf.write("%d, %s\n" % (i, row))
-    outf.close()
+    with open(output, 'w') as outf:
+        outf.writelines("%d, %s\n" % (i + 1, (i, row))
+                        for i, row in enumerate(what))
 
 
 def draw_gnuplot(what, xlabels, output, img_format, coord_legend):
@@ -102,11 +100,10 @@ def draw_gnuplot(what, xlabels, output, img_format, coord_legend):
 
     for i, row in enumerate(what):
         outfile = os.path.join(tmp_dir, 'data_%d' % i)
-        outf = open(outfile, 'w')
         xrange = max(xrange, len(row) - 2)
-        for j, val in enumerate(row[3:]):
-            outf.write("%d %s\n" % (j + 1, val))
-        outf.close()
+        with open(outfile, 'w') as outf:
+            outf.writelines("%d %s\n" % (j + 1, val)
+                            for j, val in enumerate(row[3:]))
 
     # build gnuplot script
     lines = []
@@ -152,10 +149,8 @@ def draw_gnuplot(what, xlabels, output, img_format, coord_legend):
     lines.append(cmd)
 
     plotfile = os.path.join(tmp_dir, 'spectrum.gnuplot')
-    plotf = open(plotfile, 'w')
-    for line in lines:
-        plotf.write(line + '\n')
-    plotf.close()
+    with open(plotfile, 'w') as plotf:
+        plotf.write('\n'.join(lines) + '\n')
 
     if output:
         gcore.call(['gnuplot', plotfile])
@@ -168,17 +163,13 @@ def draw_linegraph(what):
 
     xfile = os.path.join(tmp_dir, 'data_x')
 
-    xf = open(xfile, 'w')
-    for j, val in enumerate(what[0][3:]):
-        xf.write("%d\n" % (j + 1))
-    xf.close()
+    with open(xfile, 'w') as xf:
+        xf.writelines("%d\n" % (j + 1) for j in range(len(what[0]) - 3))
 
     for i, row in enumerate(what):
         yfile = os.path.join(tmp_dir, 'data_y_%d' % i)
-        yf = open(yfile, 'w')
-        for j, val in enumerate(row[3:]):
-            yf.write("%s\n" % val)
-        yf.close()
+        with open(yfile, 'w') as yf:
+            yf.writelines("%s\n" % val for val in row[3:])
         yfiles.append(yfile)
 
     sienna = '#%02x%02x%02x' % (160, 82, 45)
@@ -241,20 +232,23 @@ def main():
 
     # get y-data for gnuplot-data file
     what = []
-    s = gcore.read_command('r.what', map=rastermaps, coordinates=coords,
-                           null='0', quiet=True)
-    if len(s) == 0:
+    # r.what errors are collected in a file, a pipe could fill up and
+    # block while its output is read
+    errors = tempfile.TemporaryFile()
+    p = gcore.pipe_command('r.what', map=rastermaps, coordinates=coords,
+                           null='0', quiet=True, stderr=errors)
+    for line in p.stdout:
+        f = decode(line).rstrip('\r\n').split('|')
+        what.append([0 if v in ('', '*') else float(v) for v in f])
+    if p.wait() != 0:
+        errors.seek(0)
+        gcore.fatal(_('Query with r.what failed: %s') %
+                    decode(errors.read()).strip())
+    errors.close()
+
+    if not what:
         gcore.fatal(_('No data returned from query'))
 
-    for l in s.splitlines():
-        f = l.split('|')
-        for i, v in enumerate(f):
-            if v in ['', '*']:
-                f[i] = 0
-            else:
-                f[i] = float(v)
-        what.append(f)
-
     # build data files
     if gnuplot:
         draw_gnuplot(what, xlabels, output, img_fmt, coord_legend)
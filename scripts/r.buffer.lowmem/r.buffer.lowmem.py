@@ -61,14 +61,12 @@ scales = {
 
 
 def cleanup():
-    if grass.find_file(temp_src)['file']:
-        grass.run_command('g.remove', quiet=True, flags='fb', type='raster', name=temp_src)
     if grass.find_file(temp_dist)['file']:
         grass.run_command('g.remove', quiet=True, flags='fb', type='raster', name=temp_dist)
 
 
 def main():
-    global temp_dist, temp_src
+    global temp_dist
 
     input = options['input']
     output = options['output']
@@ -78,7 +76,6 @@ def main():
 
     tmp = str(os.getpid())
     temp_dist = "r.buffer.tmp.%s.dist" % tmp
-    temp_src = "r.buffer.tmp.%s.src" % tmp
 
     # check if input file exists
     if not grass.find_file(input)['file']:
@@ -100,25 +97,21 @@ def main():
     grass.run_command('r.grow.distance', input=input, metric=metric,
                       distance=temp_dist, flags='m')
 
+    # source cells are copied, all other cells get the zone of their distance
     if zero:
-        exp = "$temp_src = if($input == 0,null(),1)"
+        exp = "$output = if(isnull($input) ||| $input == 0,%s,1)"
     else:
-        exp = "$temp_src = if(isnull($input),null(),1)"
-
-    grass.message(_("Extracting buffers (1/2)..."))
-    grass.mapcalc(exp, temp_src=temp_src, input=input)
-
-    exp = "$output = if(!isnull($input),$input,%s)"
+        exp = "$output = if(isnull($input),%s,1)"
     if metric == 'squared':
-        for n, dist2 in enumerate(distances2):
-            exp %= "if($dist <= %f,%d,%%s)" % (dist2, n + 2)
+        zones = distances2
     else:
-        for n, dist2 in enumerate(distances1):
-            exp %= "if($dist <= %f,%d,%%s)" % (dist2, n + 2)
-    exp %= "null()"
+        zones = distances1
+    zones_exp = ''.join("if($dist <= %f,%d," % (dist, n + 2)
+                        for n, dist in enumerate(zones))
+    exp %= zones_exp + "null()" + ")" * len(zones)
 
-    grass.message(_("Extracting buffers (2/2)..."))
-    grass.mapcalc(exp, output=output, input=temp_src, dist=temp_dist)
+    grass.message(_("Extracting buffers..."))
+    grass.mapcalc(exp, output=output, input=input, dist=temp_dist)
 
     p = grass.feed_command('r.category', map=output,
                            separator=':', rules='-')
@@ -30,27 +30,40 @@
 #% description: Force center at zero
 #%end
 
-import os
-import atexit
-
 import grass.script as gscript
 from grass.script.utils import decode
 
 
-def z(n):
-    return mean + n * stddev
+# color rules filled in with the limits of the standard deviation bands
+#   around the center (n3 ... p3) and the outer limits (low, high)
+smooth_rules = '\n'.join(["%(low)s blue",
+                          "%(n2)f blue",
+                          "%(mid)s white",
+                          "%(p2)f red",
+                          "%(high)s red"])
+
+# >3 S.D. outliers colored black so they show up in d.histogram w/ white background
+banded_rules = '\n'.join(["%(low)s black",
+                          "%(n3)f black",
+                          "%(n3)f red",
+                          "%(n2)f red",
+                          "%(n2)f yellow",
+                          "%(n1)f yellow",
+                          "%(n1)f green",
+                          "%(p1)f green",
+                          "%(p1)f yellow",
+                          "%(p2)f yellow",
+                          "%(p2)f red",
+                          "%(p3)f red",
+                          "%(p3)f black",
+                          "%(high)s black"])
 
 
-def cleanup():
-    if tmpmap:
-        gscript.run_command('g.remove', flags='f', type='raster',
-                            name=tmpmap, quiet=True)
+def z(n):
+    return mean + n * stddev
 
 
 def main():
-    global tmpmap
-    tmpmap = None
-
     map = options['map']
     zero = flags['z']
     bands = flags['b']
@@ -64,11 +77,8 @@ def main():
 
         if not bands:
             # smooth free floating blue/white/red
-            rules = '\n'.join(["0% blue",
-                               "%f blue" % z(-2),
-                               "%f white" % mean,
-                               "%f red" % z(+2),
-                               "100% red"])
+            rules = smooth_rules % dict(low="0%", n2=z(-2), mid="%f" % mean,
+                                        p2=z(+2), high="100%")
         else:
             # banded free floating  black/red/yellow/green/yellow/red/black
 
@@ -76,69 +86,44 @@ def main():
             # r.reclass input="$GIS_OPT_MAP" output="${GIS_OPT_MAP}.stdevs" <<
             # EOF
 
-            # >3 S.D. outliers colored black so they show up in d.histogram w/ white background
-            rules = '\n'.join(["0% black",
-                               "%f black" % z(-3),
-                               "%f red" % z(-3),
-                               "%f red" % z(-2),
-                               "%f yellow" % z(-2),
-                               "%f yellow" % z(-1),
-                               "%f green" % z(-1),
-                               "%f green" % z(+1),
-                               "%f yellow" % z(+1),
-                               "%f yellow" % z(+2),
-                               "%f red" % z(+2),
-                               "%f red" % z(+3),
-                               "%f black" % z(+3),
-                               "100% black"])
+            rules = banded_rules % dict(low="0%", n3=z(-3), n2=z(-2),
+                                        n1=z(-1), p1=z(+1), p2=z(+2),
+                                        p3=z(+3), high="100%")
     else:
-        tmpmap = "r_col_stdev_abs_%d" % os.getpid()
-        gscript.mapcalc("$tmp = abs($map)", tmp=tmpmap, map=map)
-
         # data centered on 0  (e.g. map of deviations)
-        info = gscript.raster_info(tmpmap)
-        maxv = info['max']
+        # the smooth color table only needs the 2 S.D. percentile
+        if not bands:
+            percentile = [95.45]
+        else:
+            percentile = [95.45, 68.2689, 99.7300]
 
         # current r.univar truncates percentage to the base integer
         s = gscript.read_command('r.univar', flags='eg', map=map,
-                                 percentile=[95.45,
-                                             68.2689,
-                                             99.7300])
+                                 percentile=percentile)
         kv = gscript.parse_key_val(decode(s))
 
-        stddev1 = float(kv['percentile_68_2689'])
+        # maximum of abs(map) without writing it to a raster map first
+        maxv = max(abs(float(kv['min'])), abs(float(kv['max'])))
+
         stddev2 = float(kv['percentile_95_45'])
-        stddev3 = float(kv['percentile_99_73'])
+        if bands:
+            stddev1 = float(kv['percentile_68_2689'])
+            stddev3 = float(kv['percentile_99_73'])
 
         if not bands:
             # zero centered smooth blue/white/red
-            rules = '\n'.join(["%f blue" % -maxv,
-                               "%f blue" % -stddev2,
-                               "0 white",
-                               "%f red" % stddev2,
-                               "%f red" % maxv])
+            rules = smooth_rules % dict(low="%f" % -maxv, n2=-stddev2,
+                                        mid="0", p2=stddev2,
+                                        high="%f" % maxv)
         else:
             # zero centered banded  black/red/yellow/green/yellow/red/black
-
-            # >3 S.D. outliers colored black so they show up in d.histogram w/ white background
-            rules = '\n'.join(["%f black" % -maxv,
-                               "%f black" % -stddev3,
-                               "%f red" % -stddev3,
-                               "%f red" % -stddev2,
-                               "%f yellow" % -stddev2,
-                               "%f yellow" % -stddev1,
-                               "%f green" % -stddev1,
-                               "%f green" % stddev1,
-                               "%f yellow" % stddev1,
-                               "%f yellow" % stddev2,
-                               "%f red" % stddev2,
-                               "%f red" % stddev3,
-                               "%f black" % stddev3,
-                               "%f black" % maxv, ])
+            rules = banded_rules % dict(low="%f" % -maxv, n3=-stddev3,
+                                        n2=-stddev2, n1=-stddev1,
+                                        p1=stddev1, p2=stddev2, p3=stddev3,
+                                        high="%f" % maxv)
 
     gscript.write_command('r.colors', map=map, rules='-', stdin=rules)
 
 if __name__ == "__main__":
     options, flags = gscript.parser()
-    atexit.register(cleanup)
     main()
@@ -47,7 +47,7 @@ except ImportError:  # < Python 2.7
 from wms_base import WMSBase, GetSRSParamVal
 
 from wms_cap_parsers import WMTSCapabilitiesTree, OnEarthCapabilitiesTree
-from srs import Srs
+from srs import GetSrs
 
 
 class WMSDrv(WMSBase):
@@ -515,7 +515,7 @@ class WMSRequestMgr(BaseRequestMgr):
         # CRS:84 and CRS:83 are exception (CRS:83 and CRS:27 need to be tested)
         if srs_param in [84, 83] or version != '1.3.0':
             return bbox
-        elif Srs(GetSRSParamVal(srs_param)).axisorder == 'yx':
+        elif GetSrs(GetSRSParamVal(srs_param)).axisorder == 'yx':
             return self._flipBbox(bbox)
 
         return bbox
@@ -616,7 +616,7 @@ class WMTSRequestMgr(BaseRequestMgr):
                 if mat_set_id != mat_set_link_id:
                     continue
                 mat_set_srs = self._getMatSetSrs(mat_set)
-                if Srs(mat_set_srs).getcode() == (GetSRSParamVal(srs)).upper():
+                if GetSrs(mat_set_srs).getcode() == (GetSRSParamVal(srs)).upper():
                     suitable_mat_sets.append([mat_set, link])
 
         if not suitable_mat_sets:
@@ -739,7 +739,7 @@ class WMTSRequestMgr(BaseRequestMgr):
         tl_corner['maxy'] = float(tl_str[1])
 
         # TODO do it more generally WMS cap parser may use it in future(not needed now)???
-        s = Srs(mat_set_srs)  # NOTE not used params['srs'], it is just number, encoding needed
+        s = GetSrs(mat_set_srs)  # NOTE not used params['srs'], it is just number, encoding needed
         # TODO needs to be tested, tried only on
         # http://www.landesvermessung.sachsen.de/geoserver/gwc/service/wmts?:
         if s.getcode() == 'EPSG:4326' and s.encoding in ('uri', 'urn'):
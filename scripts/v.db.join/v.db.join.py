@@ -122,6 +122,10 @@ def main():
     select = "SELECT $colname FROM $otable WHERE $otable.$ocolumn=$table.$column"
     template = string.Template("UPDATE $table SET $colname=(%s);" % select)
 
+    # columns to be added and columns to be filled
+    new_colnames = []
+    new_colspecs = []
+    colnames = []
     for col in cols_to_add:
         # skip the vector column which is used for join
         colname = col[0]
@@ -147,24 +151,65 @@ def main():
 
         # add only the new column to the table
         if colname not in all_cols_tt:
-            try:
-                grass.run_command('v.db.addcolumn', map=map,
-                                  columns=colspec, layer=layer)
-            except CalledModuleError:
-                grass.fatal(_("Error creating column <%s>") % colname)
-
-        stmt = template.substitute(table=maptable, column=column,
-                                   otable=otable, ocolumn=ocolumn,
-                                   colname=colname)
-        grass.debug(stmt, 1)
+            new_colnames.append(colname)
+            new_colspecs.append(colspec)
+        colnames.append(colname)
+
+    # add all new columns by a single v.db.addcolumn run
+    if new_colspecs:
+        try:
+            grass.run_command('v.db.addcolumn', map=map,
+                              columns=','.join(new_colspecs), layer=layer)
+        except CalledModuleError:
+            grass.fatal(_("Error creating column <%s>") %
+                        ', '.join(new_colnames))
+
+    # fill all columns by a single db.execute run
+    if colnames:
+        # new columns are NULL where no row of the other table matches, so
+        # they can be filled by a single join of both tables on drivers
+        # supporting it, instead of one subquery per column; the join would
+        # silently pick one of several matching rows where the subquery
+        # fails, so it is used only if the join column values are unique
+        joined = False
+        if driver in ('pg', 'mysql') and len(new_colnames) == len(colnames) \
+           and otable != maptable:
+            dups = grass.db_select(
+                sql="SELECT COUNT(%s) - COUNT(DISTINCT %s) FROM %s" % (
+                    ocolumn, ocolumn, otable),
+                driver=driver, database=database)
+            joined = int(dups[0][0]) == 0
+        if joined:
+            if driver == 'pg':
+                stmt = "UPDATE %s SET %s FROM %s WHERE %s.%s=%s.%s;" % (
+                    maptable,
+                    ', '.join("%s=%s.%s" % (colname, otable, colname)
+                              for colname in colnames),
+                    otable, otable, ocolumn, maptable, column)
+            else:
+                stmt = "UPDATE %s JOIN %s ON %s.%s=%s.%s SET %s;" % (
+                    maptable, otable, otable, ocolumn, maptable, column,
+                    ', '.join("%s.%s=%s.%s" % (maptable, colname,
+                                               otable, colname)
+                              for colname in colnames))
+            grass.debug(stmt, 1)
+            stmts = [stmt]
+        else:
+            stmts = []
+            for colname in colnames:
+                stmt = template.substitute(table=maptable, column=column,
+                                           otable=otable, ocolumn=ocolumn,
+                                           colname=colname)
+                grass.debug(stmt, 1)
+                stmts.append(stmt)
         grass.verbose(
             _("Updating column <%s> of vector map <%s>...") %
-            (colname, map))
+            (', '.join(colnames), map))
         try:
-            grass.write_command('db.execute', stdin=stmt, input='-',
-                                database=database, driver=driver)
+            grass.write_command('db.execute', stdin='\n'.join(stmts),
+                                input='-', database=database, driver=driver)
         except CalledModuleError:
-            grass.fatal(_("Error filling column <%s>") % colname)
+            grass.fatal(_("Error filling column <%s>") % ', '.join(colnames))
 
     # write cmd history
     grass.vector_history(map)
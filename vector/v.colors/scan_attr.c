@@ -100,7 +100,7 @@ int scan_attr(const struct Map_info *Map, int layer, const char *column_name,
 void color_rules_to_cats(dbCatValArray *cvarr, int is_fp,
                          struct Colors *vcolors, struct Colors *colors)
 {
-    int i, cat;
+    int i, cat, same;
     dbCatVal *cv;
     int red, grn, blu;
 
@@ -110,11 +110,29 @@ void color_rules_to_cats(dbCatValArray *cvarr, int is_fp,
 	G_percent(i, cvarr->n_values, 2);
 	cv = &(cvarr->value[i]);
 	cat = cv->cat;
-	if (is_fp) {
+
+	/* equal values follow each other when sorted by value, reuse the
+	   color of the previous value instead of looking it up again */
+	if (i > 0) {
+	    if (is_fp)
+		same = cv->val.d == cvarr->value[i - 1].val.d;
+	    else
+		same = cv->val.i == cvarr->value[i - 1].val.i;
+	}
+	else
+	    same = FALSE;
+
+	if (same) {
+	    /* previous value had no color rule */
+	    if (red < 0)
+		continue;
+	}
+	else if (is_fp) {
 	    if (Rast_get_d_color((const DCELL *) &(cv->val.d), &red, &grn, &blu,
 				 vcolors) == 0) {
 		/* G_warning(_("No color rule defined for value %f"), cv->val.d); */
 		G_debug(3, "scan_attr(): cat=%d, val=%f -> no color rule", cat, cv->val.d);
+		red = -1;
 		continue;
 	    }
 	}
@@ -123,6 +141,7 @@ void color_rules_to_cats(dbCatValArray *cvarr, int is_fp,
 				 vcolors) == 0) {
 		/* G_warning(_("No color rule defined for value %d"), cv->val.i); */
 		G_debug(3, "scan_attr(): cat=%d, val=%d -> no color rule", cat, cv->val.i);
+		red = -1;
 		continue;
 	    }
 	}
@@ -1,15 +1,39 @@
+#include <stdlib.h>
+#include <string.h>
+
 #include <grass/gis.h>
 #include <grass/vector.h>
 #include <grass/dbmi.h>
 #include <grass/raster.h>
 #include <grass/glocale.h>
 
+/* max number of categories updated by one statement */
+#define MAX_CATS_PER_STMT 1000
+
+struct cat_rgb
+{
+    int cat;
+    int rgb;			/* red, green and blue packed as 0xRRGGBB */
+};
+
+static int cmp_rgb(const void *a, const void *b)
+{
+    const struct cat_rgb *ca = a;
+    const struct cat_rgb *cb = b;
+
+    if (ca->rgb != cb->rgb)
+	return ca->rgb < cb->rgb ? -1 : 1;
+
+    return (ca->cat > cb->cat) - (ca->cat < cb->cat);
+}
+
 void write_rgb_values(const struct Map_info *Map, int layer, const char *column_name,
 		      struct Colors *colors)
 {
-    int ctype, nrec, i;
+    int ctype, nrec, i, j;
     int red, grn, blu;
     int *pval;
+    struct cat_rgb *cat_rgb;
     char buf[1024];
     struct field_info *fi;
     dbDriver *driver;
@@ -71,19 +95,59 @@ void write_rgb_values(const struct Map_info *Map, int layer, const char *column_
     
     db_begin_transaction(driver);
     
-    for (i = 0; i < nrec; i++) {
-	G_percent(i, nrec, 2);
-	if (Rast_get_c_color((const CELL *) &(pval[i]), &red, &grn, &blu,
-			     colors) == 0)
-	    G_warning(_("No color value defined for category %d"), pval[i]);
+    if (strcmp(fi->driver, "dbf") == 0) {
+	/* DBF driver does not support IN (...), update category by category */
+	for (i = 0; i < nrec; i++) {
+	    G_percent(i, nrec, 2);
+	    if (Rast_get_c_color((const CELL *) &(pval[i]), &red, &grn, &blu,
+				 colors) == 0)
+		G_warning(_("No color value defined for category %d"), pval[i]);
 
-	sprintf(buf, "UPDATE %s SET \"%s\"='%d:%d:%d' WHERE %s=%d", fi->table,
-                column_name, red, grn, blu, fi->key, pval[i]);
-	G_debug(3, "\tSQL: %s", buf);
+	    sprintf(buf, "UPDATE %s SET \"%s\"='%d:%d:%d' WHERE %s=%d", fi->table,
+		    column_name, red, grn, blu, fi->key, pval[i]);
+	    G_debug(3, "\tSQL: %s", buf);
 
-	db_set_string(&stmt, buf);
-	if (db_execute_immediate(driver, &stmt) != DB_OK)
-	    G_fatal_error(_("Unable to update RGB values"));
+	    db_set_string(&stmt, buf);
+	    if (db_execute_immediate(driver, &stmt) != DB_OK)
+		G_fatal_error(_("Unable to update RGB values"));
+	}
+    }
+    else {
+	/* sort categories by color and update all categories of the same
+	   color by one statement */
+	cat_rgb = G_malloc(nrec * sizeof(struct cat_rgb));
+	for (i = 0; i < nrec; i++) {
+	    if (Rast_get_c_color((const CELL *) &(pval[i]), &red, &grn, &blu,
+				 colors) == 0)
+		G_warning(_("No color value defined for category %d"), pval[i]);
+
+	    cat_rgb[i].cat = pval[i];
+	    cat_rgb[i].rgb = (red << 16) | (grn << 8) | blu;
+	}
+	qsort(cat_rgb, nrec, sizeof(struct cat_rgb), cmp_rgb);
+
+	for (i = 0; i < nrec; i = j) {
+	    G_percent(i, nrec, 2);
+	    red = (cat_rgb[i].rgb >> 16) & 0xff;
+	    grn = (cat_rgb[i].rgb >> 8) & 0xff;
+	    blu = cat_rgb[i].rgb & 0xff;
+
+	    sprintf(buf, "UPDATE %s SET \"%s\"='%d:%d:%d' WHERE %s IN (%d",
+		    fi->table, column_name, red, grn, blu, fi->key,
+		    cat_rgb[i].cat);
+	    db_set_string(&stmt, buf);
+	    for (j = i + 1; j < nrec && j - i < MAX_CATS_PER_STMT &&
+		 cat_rgb[j].rgb == cat_rgb[i].rgb; j++) {
+		sprintf(buf, ",%d", cat_rgb[j].cat);
+		db_append_string(&stmt, buf);
+	    }
+	    db_append_string(&stmt, ")");
+	    G_debug(3, "\tSQL: %s", db_get_string(&stmt));
+
+	    if (db_execute_immediate(driver, &stmt) != DB_OK)
+		G_fatal_error(_("Unable to update RGB values"));
+	}
+	G_free(cat_rgb);
     }
     G_percent(1, 1, 1);
     